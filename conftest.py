@@ -0,0 +1,14 @@
+"""
+Configuration for the test session: generated kernels (see
+:obj:`fe25519.kernels`) are cached in a temporary directory rather than in
+the user's cache directory.
+"""
+import os
+import tempfile
+
+_kernel_cache = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+os.environ['FE25519_KERNEL_CACHE'] = _kernel_cache.name
+
+def pytest_unconfigure(config): # pylint: disable=unused-argument
+    """Remove the temporary kernel cache directory."""
+    _kernel_cache.cleanup()
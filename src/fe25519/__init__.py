@@ -1,2 +1,8 @@
 """Allow users to access the class directly."""
 from fe25519.fe25519 import fe25519
+from fe25519.fraction import fe25519_fraction
+from fe25519.powers import power_table
+from fe25519.backends import \
+    register_backend, available_backends, get_backend, set_backend
+from fe25519.lazy import lazy, evaluate
+from fe25519.streams import iter_elements, write_elements
@@ -0,0 +1,102 @@
+"""
+Batch operations over elements of the :obj:`~fe25519.fe25519.fe25519` class
+that can be awaited within an :obj:`asyncio` event loop without blocking it.
+
+The inputs are split into chunks of a configurable size. If no executor is
+supplied, the chunks are processed one at a time on the event loop thread
+and control is yielded back to the event loop after every chunk (so that the
+latency of other tasks is bounded by the time taken to process one chunk).
+If an executor is supplied, the chunks are processed within that executor
+and the event loop thread remains free. In both cases, the operation can be
+cancelled (in which case no further chunks are processed).
+"""
+from __future__ import annotations
+from typing import Any, Callable, List, Optional, Sequence, Union
+import asyncio
+import concurrent.futures
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519
+    from fe25519.backends import get_backend
+    from fe25519.parallel import chunks, apply_map, apply_batch
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+    from backends import get_backend
+    from parallel import chunks, apply_map, apply_batch
+
+async def _run(
+        task: Callable[..., List[Any]],
+        operation: Union[str, Callable[..., Any]],
+        xss: Sequence[Sequence[Any]],
+        *,
+        chunk_size: int,
+        executor: Optional[concurrent.futures.Executor]
+    ) -> List[Any]:
+    """Apply a task to all chunks and concatenate the results."""
+    backend = get_backend()
+    if executor is None:
+        results = []
+        for chunk in chunks(xss, chunk_size):
+            results.extend(task(backend, operation, chunk))
+            await asyncio.sleep(0) # Yield to other tasks between chunks.
+        return results
+
+    loop = asyncio.get_running_loop()
+    rss = await asyncio.gather(*[
+        loop.run_in_executor(executor, task, backend, operation, chunk)
+        for chunk in chunks(xss, chunk_size)
+    ])
+    return [r for rs in rss for r in rs]
+
+async def amap(
+        operation: Union[str, Callable[..., Any]],
+        *xss: Sequence[Any],
+        chunk_size: int = 256,
+        executor: Optional[concurrent.futures.Executor] = None
+    ) -> List[Any]:
+    """
+    Apply an operation to every element (or to every tuple of corresponding
+    elements, if more than one sequence is supplied). The operation may be
+    specified using the name of a method of the class.
+
+    >>> two = fe25519.one() + fe25519.one()
+    >>> asyncio.run(amap('sq', [two] * 3, chunk_size=2)) == [two.sq()] * 3
+    True
+    """
+    return await _run(apply_map, operation, xss, chunk_size=chunk_size, executor=executor)
+
+async def abatch(
+        operation: Union[str, Callable[..., Sequence[Any]]],
+        *xss: Sequence[Any],
+        chunk_size: int = 256,
+        executor: Optional[concurrent.futures.Executor] = None
+    ) -> List[Any]:
+    """
+    Apply a batch operation (such as :obj:`~fe25519.fe25519.fe25519.mul_many`)
+    to chunks of the supplied sequences and concatenate the results.
+
+    >>> two = fe25519.one() + fe25519.one()
+    >>> asyncio.run(abatch('mul_many', [two] * 3, [two] * 3)) == [two * two] * 3
+    True
+    """
+    return await _run(apply_batch, operation, xss, chunk_size=chunk_size, executor=executor)
+
+async def abatch_invert(
+        xs: Sequence[fe25519],
+        chunk_size: int = 256,
+        executor: Optional[concurrent.futures.Executor] = None
+    ) -> List[fe25519]:
+    """
+    Compute the multiplicative inverses of all elements in a sequence using
+    :obj:`~fe25519.fe25519.fe25519.invert_many` (and, thus, a single
+    inversion per chunk).
+
+    >>> two = fe25519.one() + fe25519.one()
+    >>> [r * two for r in asyncio.run(abatch_invert([two] * 3))] == [fe25519.one()] * 3
+    True
+    """
+    return await abatch('invert_many', xs, chunk_size=chunk_size, executor=executor)
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
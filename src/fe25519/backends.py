@@ -0,0 +1,504 @@
+"""
+Registry of interchangeable arithmetic backends for the
+:obj:`~fe25519.fe25519.fe25519` class.
+
+A backend consists of replacements for some of the methods of the class.
+Any method that a backend does not replace retains its original (limb-based)
+implementation. The following backends are available:
+
+* ``'limb'`` (the default) uses five 51-bit limbs, exactly as in libsodium;
+* ``'bigint'`` uses built-in Python integers and modular exponentiation;
+* ``'numpy'`` (available only if `NumPy <https://numpy.org>`__ is installed)
+  implements the batch operations (such as
+  :obj:`~fe25519.fe25519.fe25519.mul_many`) using vectorized arithmetic over
+  ten limbs per element.
+
+The ``'bigint'`` and ``'numpy'`` backends compute exact field arithmetic,
+which coincides with that of the limb-based methods whenever all limbs of
+all inputs are below ``2**54`` (``2**53`` for
+:obj:`~fe25519.fe25519.fe25519.sq2`, which doubles its intermediate results
+before they are reduced), as is the case for every element produced by this
+library. Inputs that do not satisfy this condition are delegated to
+the limb-based methods so that results are identical for every input. Unlike
+the limb-based methods, these backends do not attempt to avoid data-dependent
+branches.
+
+The backend can be selected using :obj:`set_backend` or by setting the
+``FE25519_BACKEND`` environment variable before this library is imported.
+
+>>> set_backend('bigint')
+>>> get_backend()
+'bigint'
+>>> set_backend('limb')
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import os
+import threading
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519, _limbs
+except ImportError: # pragma: no cover
+    # Module is being executed directly (so this is not the package).
+    from fe25519 import fe25519, _limbs # pylint: disable=cyclic-import
+
+# NumPy is imported only once the NumPy-based backend is requested.
+numpy = None # pylint: disable=invalid-name
+
+_P = 2 ** 255 - 19
+_MASK = 2251799813685247
+_TIGHT = 2 ** 54
+
+_SQRTM1 = 19681161376707505956807079304988542015446066515923890162744021073123829784752
+
+def _value(ns: Sequence[int]) -> int:
+    """Compute the integer represented by a sequence of five limbs."""
+    return ns[0] + (ns[1] << 51) + (ns[2] << 102) + (ns[3] << 153) + (ns[4] << 204)
+
+def _tight(*xs: fe25519) -> bool:
+    """Determine whether all limbs of all supplied elements are below ``2**54``."""
+    return all(max(x.ns) < _TIGHT for x in xs)
+
+class backend:
+    """
+    Named collection of replacements for methods of the
+    :obj:`~fe25519.fe25519.fe25519` class.
+    """
+    def __init__(self: backend, name: str, methods: Dict[str, Any]):
+        self.name = name
+        self.methods = methods
+
+_registry: Dict[str, backend] = {}
+_lock = threading.Lock()
+_current = ['limb']
+
+def register_backend(name: str, methods: Dict[str, Any]):
+    """
+    Register a backend consisting of replacements for the methods of the
+    :obj:`~fe25519.fe25519.fe25519` class (to be installed when the backend
+    is selected). Static methods must be wrapped using :obj:`staticmethod`.
+
+    >>> register_backend('example', {})
+    >>> 'example' in available_backends()
+    True
+    """
+    with _lock:
+        _registry[name] = backend(name, methods)
+
+def available_backends() -> List[str]:
+    """
+    Return the names of all available backends (importing NumPy in order to
+    determine whether the NumPy-based backend is available).
+
+    >>> available_backends()[:2]
+    ['limb', 'bigint']
+    """
+    _register_numpy()
+    return list(_registry)
+
+def get_backend() -> str:
+    """
+    Return the name of the backend that is currently selected.
+
+    >>> get_backend()
+    'limb'
+    """
+    return _current[0]
+
+def set_backend(name: str):
+    """
+    Select the backend that the :obj:`~fe25519.fe25519.fe25519` class uses.
+
+    >>> set_backend('abc')
+    Traceback (most recent call last):
+      ...
+    ValueError: unknown backend: 'abc'
+    """
+    if name == 'numpy':
+        _register_numpy()
+    if name not in _registry:
+        raise ValueError('unknown backend: ' + repr(name))
+
+    with _lock:
+        # Restore all original methods and then install any replacements.
+        for (method, implementation) in _registry['limb'].methods.items():
+            setattr(fe25519, method, implementation)
+        for (method, implementation) in _registry[name].methods.items():
+            setattr(fe25519, method, implementation)
+        _current[0] = name
+
+# The limb-based backend consists of the original methods of the class.
+_names = [
+    'reduce', '__add__', '__sub__', '__mul__', 'sq', 'sq2', 'pow22523', 'invert',
+    'sqrt_ratio_m1_ristretto255', 'chi25519',
+    'add_many', 'sub_many', 'mul_many', 'sq_many', 'invert_many',
+    'sqrt_ratio_m1_ristretto255_many'
+]
+_limb = {name: fe25519.__dict__[name] for name in _names}
+register_backend('limb', _limb)
+
+def _unary(
+        operation: Callable[[int], int], method: str, bound: int = _TIGHT
+    ) -> Callable[[fe25519], fe25519]:
+    """
+    Build a unary method for the integer-based backend (that delegates inputs
+    having a limb that is not below the bound to the limb-based method).
+    """
+    fallback = _limb[method]
+    def method_(self: fe25519) -> fe25519:
+        if max(self.ns) < bound:
+            return fe25519(_limbs(operation(_value(self.ns))))
+        return fallback(self)
+    method_.__doc__ = fallback.__doc__
+    return method_
+
+def _binary(
+        operation: Callable[[int, int], int], method: str
+    ) -> Callable[[fe25519, fe25519], fe25519]:
+    """Build a binary method for the integer-based backend."""
+    fallback = _limb[method]
+    def method_(self: fe25519, other: fe25519) -> fe25519:
+        if not isinstance(other, fe25519):
+            return NotImplemented
+        if max(self.ns) < _TIGHT and max(other.ns) < _TIGHT:
+            return fe25519(_limbs(operation(_value(self.ns), _value(other.ns))))
+        return fallback(self, other)
+    method_.__doc__ = fallback.__doc__
+    return method_
+
+def _bigint_reduce(self: fe25519) -> fe25519:
+    """Reduce an element to a canonical representation."""
+    if max(self.ns) < 2 ** 64: # Reduction is exact for all valid limbs.
+        return fe25519(_limbs(_value(self.ns) % _P))
+    return _limb['reduce'](self)
+
+def _bigint_sqrt_ratio_m1_ristretto255(self: fe25519, v: fe25519) -> Tuple[fe25519, int]:
+    """Compute the result of a specialized root operation."""
+    if not _tight(self, v):
+        return _limb['sqrt_ratio_m1_ristretto255'](self, v)
+    (u, v) = (_value(self.ns) % _P, _value(v.ns) % _P)
+    (x, was_square) = _sqrt_ratio_m1_ristretto255(u, v)
+    return (fe25519(_limbs(x)), was_square)
+
+def _sqrt_ratio_m1_ristretto255(u: int, v: int) -> Tuple[int, int]:
+    """
+    Compute the result of a specialized root operation on canonical
+    integers (shared with batch implementations).
+    """
+    v3 = (v * v * v) % _P
+    x = (u * v3 * pow((u * v3 * v3 * v) % _P, (_P - 5) // 8, _P)) % _P
+    return _select_root(u, v, x)
+
+def _select_root(u: int, v: int, x: int) -> Tuple[int, int]:
+    """
+    Complete a specialized root operation on canonical integers given the
+    candidate root ``x = uv^3(uv^7)^((p-5)/8)``.
+    """
+    vxx = (v * x * x) % _P
+    has_m_root = int(vxx == u)
+    has_p_root = int(vxx == (-u) % _P)
+    has_f_root = int(vxx == (-u * _SQRTM1) % _P)
+    if has_p_root | has_f_root:
+        x = (x * _SQRTM1) % _P
+    if x & 1:
+        x = _P - x
+    return (x, has_m_root | has_p_root)
+
+def _bigint_sqrt_ratio_m1_ristretto255_many(
+        us: Sequence[fe25519], vs: Sequence[fe25519]
+    ) -> List[Tuple[fe25519, int]]:
+    """
+    Compute the results of a specialized root operation for all pairs of
+    corresponding elements in two sequences.
+    """
+    if not (_tight(*us) and _tight(*vs)):
+        return _limb['sqrt_ratio_m1_ristretto255_many'].__func__(us, vs)
+    return [
+        (fe25519(_limbs(x)), was_square)
+        for (x, was_square) in (
+            _sqrt_ratio_m1_ristretto255(_value(u.ns) % _P, _value(v.ns) % _P)
+            for (u, v) in zip(us, vs)
+        )
+    ]
+
+def _bigint_many(operation: Callable[..., int], method: str) -> Callable[..., List[fe25519]]:
+    """Build a batch method for the integer-based backend."""
+    fallback = _limb[method].__func__
+    def method_(*xss: Sequence[fe25519]) -> List[fe25519]:
+        if not all(_tight(*xs) for xs in xss):
+            return fallback(*xss)
+        return [
+            fe25519(_limbs(operation(*[_value(x.ns) for x in xs])))
+            for xs in zip(*xss)
+        ]
+    method_.__doc__ = fallback.__doc__
+    return staticmethod(method_)
+
+def _bigint_invert_many(xs: Sequence[fe25519]) -> List[fe25519]:
+    """
+    Compute the multiplicative inverses of all elements in a sequence
+    using a single inversion (via Montgomery's trick).
+    """
+    if not _tight(*xs):
+        return _limb['invert_many'].__func__(xs)
+    return [fe25519(_limbs(n)) for n in _invert_many([_value(x.ns) % _P for x in xs])]
+
+def _invert_many(ns: List[int]) -> List[int]:
+    """
+    Invert canonical integers using Montgomery's trick (mapping zero to zero),
+    shared with other batch implementations.
+    """
+    (ps, p) = ([], 1)
+    for n in ns:
+        ps.append(p)
+        p = (p * n) % _P if n else p
+    inverse = pow(p, _P - 2, _P)
+    rs = [0] * len(ns)
+    for i in range(len(ns) - 1, -1, -1):
+        if ns[i]:
+            rs[i] = (inverse * ps[i]) % _P
+            inverse = (inverse * ns[i]) % _P
+    return rs
+
+register_backend('bigint', {
+    'reduce': _bigint_reduce,
+    '__add__': _binary(lambda m, n: (m + n) % _P, '__add__'),
+    '__sub__': _binary(lambda m, n: (m - n) % _P, '__sub__'),
+    '__mul__': _binary(lambda m, n: (m * n) % _P, '__mul__'),
+    'sq': _unary(lambda n: (n * n) % _P, 'sq'),
+    'sq2': _unary(lambda n: (2 * n * n) % _P, 'sq2', 2 ** 53),
+    'pow22523': _unary(lambda n: pow(n, (_P - 5) // 8, _P), 'pow22523'),
+    'invert': _unary(lambda n: pow(n, _P - 2, _P), 'invert'),
+    'chi25519': _unary(lambda n: pow(n, (_P - 1) // 2, _P), 'chi25519'),
+    'sqrt_ratio_m1_ristretto255': _bigint_sqrt_ratio_m1_ristretto255,
+    'sqrt_ratio_m1_ristretto255_many': staticmethod(_bigint_sqrt_ratio_m1_ristretto255_many),
+    'add_many': _bigint_many(lambda m, n: (m + n) % _P, 'add_many'),
+    'sub_many': _bigint_many(lambda m, n: (m - n) % _P, 'sub_many'),
+    'mul_many': _bigint_many(lambda m, n: (m * n) % _P, 'mul_many'),
+    'sq_many': _bigint_many(lambda n: (n * n) % _P, 'sq_many'),
+    'invert_many': staticmethod(_bigint_invert_many)
+})
+
+class vector:
+    """
+    Batch of elements represented using NumPy arrays holding ten limbs
+    (alternating between 26 and 25 bits, as in the ``ref10`` implementation
+    of Ed25519) per element. Products of such limbs fit (with room to spare)
+    into signed 64-bit integers.
+    """
+    # Multiples of the modulus (in the ten-limb radix) used for subtraction.
+    _P4 = [
+        4 * 67108845, 4 * 33554431, 4 * 67108863, 4 * 33554431, 4 * 67108863,
+        4 * 33554431, 4 * 67108863, 4 * 33554431, 4 * 67108863, 4 * 33554431
+    ]
+
+    def __init__(self: vector, hs: Any):
+        self.hs = hs # Array of shape ``(10, n)``.
+
+    @staticmethod
+    def from_elements(xs: Sequence[fe25519]) -> vector:
+        """
+        Convert a sequence of elements (each having limbs below ``2**54``)
+        into a vector.
+        """
+        ls = numpy.array([x.ns for x in xs], dtype=numpy.int64).reshape((len(xs), 5)).T.copy()
+        for i in range(4):
+            ls[i + 1] += ls[i] >> 51
+            ls[i] &= _MASK
+        ls[0] += 19 * (ls[4] >> 51)
+        ls[4] &= _MASK
+        ls[1] += ls[0] >> 51
+        ls[0] &= _MASK
+        hs = numpy.empty((10, len(xs)), dtype=numpy.int64)
+        hs[0::2] = ls & 67108863
+        hs[1::2] = ls >> 26
+        return vector(hs)
+
+    def to_elements(self: vector) -> List[fe25519]:
+        """Convert this vector into a list of elements."""
+        ls = self.hs[0::2] + (self.hs[1::2] << 26)
+        return [fe25519(ns) for ns in ls.T.tolist()]
+
+    def __len__(self: vector) -> int:
+        """Return the number of elements in this vector."""
+        return self.hs.shape[1]
+
+    def __getitem__(self: vector, index: Any) -> vector:
+        """Return a vector containing a subset of the elements."""
+        return vector(self.hs[:, index])
+
+    @staticmethod
+    def concatenate(vs: Sequence[vector]) -> vector:
+        """Concatenate a sequence of vectors."""
+        return vector(numpy.concatenate([v.hs for v in vs], axis=1))
+
+    @staticmethod
+    def _carry(hs: Any) -> Any:
+        """Carry the limbs of (non-negative) column sums."""
+        for i in range(10):
+            bits = 25 + (1 - (i % 2))
+            carry = hs[i] >> bits
+            hs[i] -= carry << bits
+            if i < 9:
+                hs[i + 1] += carry
+            else:
+                hs[0] += 19 * carry
+        carry = hs[0] >> 26
+        hs[0] -= carry << 26
+        hs[1] += carry
+        return hs
+
+    def __add__(self: vector, other: vector) -> vector:
+        """Compute the elementwise sums of two vectors."""
+        return vector(vector._carry(self.hs + other.hs))
+
+    def __sub__(self: vector, other: vector) -> vector:
+        """Compute the elementwise differences of two vectors."""
+        p4 = numpy.array(vector._P4, dtype=numpy.int64).reshape((10, 1))
+        return vector(vector._carry(self.hs + p4 - other.hs))
+
+    def __mul__(self: vector, other: vector) -> vector:
+        """Compute the elementwise products of two vectors."""
+        (f, g) = (self.hs, other.hs)
+        g19 = 19 * g
+        f2 = f.copy()
+        f2[1::2] <<= 1 # Products of two odd limbs are doubled.
+        hs = numpy.zeros(f.shape, dtype=numpy.int64)
+        for i in range(10):
+            for j in range(10):
+                fi = f2[i] if (i % 2 == 1 and j % 2 == 1) else f[i]
+                gj = g[j] if i + j < 10 else g19[j]
+                hs[(i + j) % 10] += fi * gj
+        return vector(vector._carry(hs))
+
+    def sq(self: vector) -> vector: # pylint: disable=invalid-name
+        """Compute the elementwise squares of this vector."""
+        return self * self
+
+    def sq_n(self: vector, n: int) -> vector:
+        """Compute ``n`` consecutive elementwise squarings of this vector."""
+        result = self
+        for _ in range(n):
+            result = result * result
+        return result
+
+    def pow22523(self: vector) -> vector:
+        """
+        Compute the elementwise results of exponentiation by ``(p-5)/8``
+        (using the addition chain of
+        :obj:`~fe25519.fe25519.fe25519.pow22523`).
+        """
+        t0 = self.sq()
+        t1 = self * t0.sq_n(2)
+        t0 = t0 * t1
+        t0 = t1 * t0.sq()
+        t0 = t0.sq_n(5) * t0
+        t1 = t0.sq_n(10) * t0
+        t1 = t1.sq_n(20) * t1
+        t0 = t1.sq_n(10) * t0
+        t1 = t0.sq_n(50) * t0
+        t1 = t1.sq_n(100) * t1
+        t0 = t1.sq_n(50) * t0
+        return t0.sq_n(2) * self
+
+    def invert(self: vector) -> vector:
+        """
+        Compute the elementwise inverses of this vector (none of which may
+        be zero) using a product tree and a single scalar inversion.
+        """
+        if len(self) == 1:
+            return vector.from_elements([self.to_elements()[0].invert()])
+        padded = self
+        if len(self) % 2 == 1:
+            padded = vector.concatenate([self, vector.from_elements([fe25519.one()])])
+        (evens, odds) = (padded[0::2], padded[1::2])
+        inverses = (evens * odds).invert()
+        hs = numpy.empty(padded.hs.shape, dtype=numpy.int64)
+        hs[:, 0::2] = (inverses * odds).hs
+        hs[:, 1::2] = (inverses * evens).hs
+        return vector(hs[:, :len(self)])
+
+def _numpy_many(method: str) -> Callable[..., List[fe25519]]:
+    """Build a batch method for the NumPy-based backend."""
+    fallback = _limb[method].__func__
+    operation = {
+        'add_many': vector.__add__, 'sub_many': vector.__sub__,
+        'mul_many': vector.__mul__, 'sq_many': vector.sq
+    }[method]
+    def method_(*xss: Sequence[fe25519]) -> List[fe25519]:
+        if len(xss[0]) == 0 or not all(_tight(*xs) for xs in xss):
+            return fallback(*xss)
+        return operation(*[vector.from_elements(xs) for xs in xss]).to_elements()
+    method_.__doc__ = fallback.__doc__
+    return staticmethod(method_)
+
+def _numpy_invert_many(xs: Sequence[fe25519]) -> List[fe25519]:
+    """
+    Compute the multiplicative inverses of all elements in a sequence
+    using a single inversion (via a vectorized product tree).
+    """
+    if len(xs) == 0 or not _tight(*xs):
+        return _limb['invert_many'].__func__(xs)
+    zs = [_value(x.ns) % _P == 0 for x in xs]
+    ys = [fe25519.one() if z else x for (x, z) in zip(xs, zs)]
+    rs = vector.from_elements(ys).invert().to_elements()
+    return [fe25519.zero() if z else r for (r, z) in zip(rs, zs)]
+
+def _numpy_sqrt_ratio_m1_ristretto255_many(
+        us: Sequence[fe25519], vs: Sequence[fe25519]
+    ) -> List[Tuple[fe25519, int]]:
+    """
+    Compute the results of a specialized root operation for all pairs of
+    corresponding elements in two sequences (performing the exponentiation
+    for all of them using vectorized arithmetic).
+    """
+    if len(us) == 0 or not (_tight(*us) and _tight(*vs)):
+        return _limb['sqrt_ratio_m1_ristretto255_many'].__func__(us, vs)
+    (u, v) = (vector.from_elements(us), vector.from_elements(vs))
+    v3 = v.sq() * v
+    xs = (u * v3 * (u * v3.sq() * v).pow22523()).to_elements()
+    return [
+        (fe25519(_limbs(r)), was_square)
+        for (r, was_square) in (
+            _select_root(_value(u.ns) % _P, _value(v.ns) % _P, _value(x.ns) % _P)
+            for (u, v, x) in zip(us, vs, xs)
+        )
+    ]
+
+_numpy_imported = [False]
+
+def _register_numpy():
+    """
+    Import NumPy and register the NumPy-based backend (if NumPy is installed)
+    the first time this function is invoked, so that importing this library
+    does not incur the cost of importing NumPy.
+    """
+    global numpy # pylint: disable=global-statement
+    if _numpy_imported[0]:
+        return
+    _numpy_imported[0] = True
+    try:
+        import numpy as numpy_ # pylint: disable=import-outside-toplevel
+    except ImportError: # pragma: no cover
+        return
+    numpy = numpy_
+    register_backend('numpy', {
+        'add_many': _numpy_many('add_many'),
+        'sub_many': _numpy_many('sub_many'),
+        'mul_many': _numpy_many('mul_many'),
+        'sq_many': _numpy_many('sq_many'),
+        'invert_many': staticmethod(_numpy_invert_many),
+        'sqrt_ratio_m1_ristretto255_many': staticmethod(_numpy_sqrt_ratio_m1_ristretto255_many)
+    })
+
+def _backend_from_environment():
+    """Select the backend specified using the environment (if any)."""
+    name = os.environ.get('FE25519_BACKEND')
+    if name:
+        set_backend(name)
+
+_backend_from_environment()
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
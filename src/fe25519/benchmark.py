@@ -0,0 +1,113 @@
+"""
+Benchmark of the scalar and batch operations of the
+:obj:`~fe25519.fe25519.fe25519` class for each available backend.
+
+This module can be executed directly (supplying the number of elements
+and, optionally, a list of backends):
+
+.. code-block:: bash
+
+    python -m fe25519.benchmark --size 1000 --backends limb bigint
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import secrets
+import time
+
+try:
+    from fe25519.fe25519 import fe25519
+    from fe25519.backends import available_backends, get_backend, set_backend
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+    from backends import available_backends, get_backend, set_backend
+
+def elements(size: int) -> List[fe25519]:
+    """
+    Generate a list of random elements (with canonical limbs).
+
+    >>> len(elements(3))
+    3
+    """
+    return [fe25519.from_bytes(secrets.token_bytes(32)) for _ in range(size)]
+
+def operations(xs: List[fe25519], ys: List[fe25519]) -> Dict[str, Callable[[], object]]:
+    """
+    Build the collection of benchmarked operations (each of which is a
+    function that applies an operation to the supplied lists of elements).
+
+    >>> functions = operations(elements(2), elements(2))
+    >>> len(functions['mul']())
+    2
+    """
+    ns = fe25519.to_int_many(xs)
+    return {
+        'mul': lambda: [x * y for (x, y) in zip(xs, ys)],
+        'sq': lambda: [x.sq() for x in xs],
+        'mul_add': lambda: [x.mul_add(y, x) for (x, y) in zip(xs, ys)],
+        'sq_mul': lambda: [x.sq_mul(y) for (x, y) in zip(xs, ys)],
+        'invert': lambda: [x.invert() for x in xs],
+        'sqrt_ratio_m1_ristretto255': lambda: [
+            x.sqrt_ratio_m1_ristretto255(y) for (x, y) in zip(xs, ys)
+        ],
+        'to_bytes': lambda: [x.to_bytes() for x in xs],
+        'to_int': lambda: [x.to_int() for x in xs],
+        'from_int_many': lambda: fe25519.from_int_many(ns),
+        'mul_many': lambda: fe25519.mul_many(xs, ys),
+        'sq_many': lambda: fe25519.sq_many(xs),
+        'invert_many': lambda: fe25519.invert_many(xs),
+        'sqrt_ratio_m1_ristretto255_many': lambda: fe25519.sqrt_ratio_m1_ristretto255_many(xs, ys),
+        'is_zero_many': lambda: fe25519.is_zero_many(xs),
+        'elligator2_many': lambda: fe25519.elligator2_many(xs)
+    }
+
+def benchmark(name: str, size: int = 1000) -> Dict[str, float]:
+    """
+    Measure the time (in seconds per element) taken by each benchmarked
+    operation when using the specified backend.
+
+    >>> timings = benchmark('limb', 2)
+    >>> all(t > 0 for t in timings.values())
+    True
+    """
+    (xs, ys) = (elements(size), elements(size))
+    previous = get_backend()
+    set_backend(name)
+    try:
+        timings = {}
+        for (operation, function) in operations(xs, ys).items():
+            start = time.perf_counter()
+            function()
+            timings[operation] = (time.perf_counter() - start) / size
+        return timings
+    finally:
+        set_backend(previous)
+
+def main(arguments: Optional[Sequence[str]] = None):
+    """
+    Run benchmarks for the specified backends and print a table of the
+    results (in microseconds per element).
+
+    >>> main(['--size', '1', '--backends', 'limb']) # doctest: +ELLIPSIS
+    operation ... limb
+    mul ...
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0].strip())
+    parser.add_argument('--size', type=int, default=1000, help='number of elements')
+    parser.add_argument(
+        '--backends', nargs='+', default=available_backends(), help='backends to benchmark'
+    )
+    args = parser.parse_args(arguments)
+
+    results = {name: benchmark(name, args.size) for name in args.backends}
+    names = list(results[args.backends[0]])
+    width = max(len(operation) for operation in names)
+    print(' '.join(['operation'.ljust(width)] + [name.rjust(12) for name in args.backends]))
+    for operation in names:
+        print(' '.join(
+            [operation.ljust(width)] +
+            [f'{10 ** 6 * results[name][operation]:.2f}'.rjust(12) for name in args.backends]
+        ))
+
+if __name__ == '__main__':
+    main() # pragma: no cover
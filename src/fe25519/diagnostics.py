@@ -0,0 +1,142 @@
+"""
+Memory diagnostics for the scalar and batch operations of the
+:obj:`~fe25519.fe25519.fe25519` class, reporting the retained memory blocks,
+retained memory, and peak memory (per element) of each operation for each
+available backend using :obj:`tracemalloc`.
+
+This module can be executed directly (supplying the number of elements in
+the synthetic workload and, optionally, lists of backends and operations):
+
+.. code-block:: bash
+
+    python -m fe25519.diagnostics --size 100000 --backends numpy --operations mul_many
+
+Figures are reported per element, so they can be scaled to larger batches.
+Only blocks that are still allocated once an operation returns (*i.e.*,
+those retained by its result) are counted, so temporary objects are
+reflected only in the peak memory.
+Note that tracing allocations is slow within the large generated kernels
+(see :obj:`fe25519.kernels`) used by the limb-based inversion and root
+methods (each invocation may take seconds), so a small workload size
+(such as the default) is advisable when profiling those operations.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Optional, Sequence
+import argparse
+import gc
+import tracemalloc
+
+try:
+    from fe25519.backends import available_backends, get_backend, set_backend
+    from fe25519 import benchmark
+except ImportError: # pragma: no cover
+    from backends import available_backends, get_backend, set_backend # Module is being executed directly.
+    import benchmark
+
+def _measure(function: Callable[[], object], size: int) -> Dict[str, float]:
+    """
+    Measure the allocations of one invocation of a function (while keeping
+    its result alive), normalized by the number of elements.
+    """
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = function()
+    (current, peak) = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    del result
+    retained_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, 'filename')
+        if stat.traceback[0].filename != tracemalloc.__file__ # Exclude the first snapshot.
+    )
+    return {
+        'retained_blocks': retained_blocks / size,
+        'retained': (current - baseline) / size,
+        'peak': (peak - baseline) / size
+    }
+
+def profile(
+        name: str, size: int = 16, operations: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the memory footprint of each benchmarked operation (see
+    :obj:`fe25519.benchmark`) on a synthetic workload of the specified size
+    when using the specified backend, as well as that of the elements
+    themselves (under ``'elements'``). For each operation, the numbers of
+    memory blocks and of bytes retained by the result and the peak number
+    of bytes allocated (including temporary objects) are reported per
+    element. Each operation is invoked once before tracing
+    begins so that one-time allocations (such as those of generated kernels)
+    are excluded. A subset of the operations can optionally be specified.
+
+    >>> footprints = profile('bigint', 2)
+    >>> footprints['elements']['retained'] > 0
+    True
+    >>> all(f['peak'] >= f['retained'] for f in footprints.values())
+    True
+    """
+    (xs, ys) = (benchmark.elements(size), benchmark.elements(size))
+    previous = get_backend()
+    set_backend(name)
+    tracing = tracemalloc.is_tracing()
+    try:
+        functions = {
+            'elements': lambda: benchmark.elements(size), **benchmark.operations(xs, ys)
+        }
+        functions = {
+            operation: function for (operation, function) in functions.items()
+            if operations is None or operation in operations
+        }
+        for function in functions.values():
+            function()
+        if not tracing:
+            tracemalloc.start()
+        return {
+            operation: _measure(function, size)
+            for (operation, function) in functions.items()
+        }
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+        set_backend(previous)
+
+def main(arguments: Optional[Sequence[str]] = None):
+    """
+    Profile the specified backends and print a table of the results (the
+    numbers of retained blocks, retained bytes, and peak bytes per element).
+
+    >>> main(['--size', '1', '--backends', 'limb', '--operations', 'mul']) # doctest: +ELLIPSIS
+    operation ... limb:retained_blocks ... limb:retained ... limb:peak
+    mul ...
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0].strip())
+    parser.add_argument('--size', type=int, default=16, help='number of elements')
+    parser.add_argument(
+        '--backends', nargs='+', default=available_backends(), help='backends to profile'
+    )
+    parser.add_argument(
+        '--operations', nargs='+', choices=['elements', *benchmark.operations([], [])],
+        metavar='OPERATION', help='operations to profile'
+    )
+    args = parser.parse_args(arguments)
+
+    results = {name: profile(name, args.size, args.operations) for name in args.backends}
+    operations = list(results[args.backends[0]])
+    width = max(len('operation'), *(len(operation) for operation in operations))
+    columns = ['retained_blocks', 'retained', 'peak']
+    print(' '.join(
+        ['operation'.ljust(width)] +
+        [f'{name}:{column}'.rjust(24) for name in args.backends for column in columns]
+    ))
+    for operation in operations:
+        print(' '.join(
+            [operation.ljust(width)] +
+            [
+                f'{results[name][operation][column]:.1f}'.rjust(24)
+                for name in args.backends for column in columns
+            ]
+        ))
+
+if __name__ == '__main__':
+    main() # pragma: no cover
@@ -0,0 +1,475 @@
+"""
+Differential testing harness that compares the results of every operation
+of the :obj:`~fe25519.fe25519.fe25519` class (for each available backend)
+with those of the reference implementations in :obj:`fe25519.reference`,
+reporting the throughput of each operation alongside the number of
+mismatches.
+
+Inputs are drawn from a seeded pseudorandom number generator (so that any
+mismatch can be reproduced) and include edge cases such as zero, values
+near ``p``, and limbs at the boundaries of their permitted ranges. There
+are two input domains:
+
+* ``'tight'`` inputs have limbs below ``2**54`` (or ``2**53`` for the
+  operations that double or add their inputs before multiplying them), as
+  is the case for every element produced by this library, and every
+  operation must agree with the reference implementation on these inputs;
+* ``'wide'`` inputs have arbitrary limbs below ``2**64``. The limb-based
+  methods wrap intermediate results modulo ``2**64`` (exactly as in
+  libsodium), so only the operations that remain exact on such inputs are
+  compared with the reference implementation. The operations implemented
+  using generated kernels (see :obj:`fe25519.kernels`) are compared with
+  method chains (see :obj:`chains`) built from the limb-based
+  multiplication, squaring, addition, and subtraction methods. The
+  results of all other operations are compared with those of the
+  ``'limb'`` backend, so wide inputs for those operations are not covered
+  when testing the ``'limb'`` backend itself.
+
+This module can be executed directly (supplying the number of inputs per
+operation and, optionally, lists of backends and operations):
+
+.. code-block:: bash
+
+    python -m fe25519.differential --count 1000000 --backends limb bigint
+"""
+from __future__ import annotations
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+import argparse
+import random
+import sys
+import time
+
+try:
+    from fe25519.fe25519 import fe25519
+    from fe25519.backends import available_backends, get_backend, set_backend
+    from fe25519 import reference
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+    from backends import available_backends, get_backend, set_backend
+    import reference
+
+_MASK = 2 ** 51 - 1
+_EDGES = [
+    [0, 0, 0, 0, 0],
+    [1, 0, 0, 0, 0],
+    [_MASK - 19, _MASK, _MASK, _MASK, _MASK], # p - 1
+    [_MASK - 18, _MASK, _MASK, _MASK, _MASK], # p
+    [_MASK - 17, _MASK, _MASK, _MASK, _MASK], # p + 1
+    [_MASK, _MASK, _MASK, _MASK, _MASK], # 2**255 - 1
+    [0, 0, 0, 0, 2 ** 51] # 2**255
+]
+_ENCODINGS = [
+    reference.P.to_bytes(32, 'little'),
+    (reference.P - 1).to_bytes(32, 'little'),
+    (reference.P + 1).to_bytes(32, 'little'),
+    bytes(32),
+    bytes([255] * 32),
+    bytes([0] * 31 + [128])
+]
+
+def _sq_n(z: fe25519, n: int) -> fe25519:
+    """Compute a sequence of squarings."""
+    for _ in range(n):
+        z = z.sq()
+    return z
+
+def pow22523_chain(z: fe25519) -> fe25519:
+    """
+    Method chain corresponding to :obj:`~fe25519.fe25519.fe25519.pow22523`.
+
+    >>> pow22523_chain(fe25519.one()) == fe25519.one()
+    True
+    """
+    t0 = z.sq()
+    t1 = z * _sq_n(t0, 2)
+    t0 = t1 * _sq_n(t0 * t1, 1)
+    t0 = _sq_n(t0, 5) * t0
+    t1 = _sq_n(t0, 10) * t0
+    t1 = _sq_n(t1, 20) * t1
+    t0 = _sq_n(t1, 10) * t0
+    t1 = _sq_n(t0, 50) * t0
+    t1 = _sq_n(t1, 100) * t1
+    t0 = _sq_n(t1, 50) * t0
+    return _sq_n(t0, 2) * z
+
+def invert_chain(z: fe25519) -> fe25519:
+    """
+    Method chain corresponding to :obj:`~fe25519.fe25519.fe25519.invert`.
+
+    >>> invert_chain(fe25519.one()) == fe25519.one()
+    True
+    """
+    t0 = z.sq()
+    t1 = z * _sq_n(t0, 2)
+    t0 = t0 * t1
+    t1 = t1 * t0.sq()
+    t1 = _sq_n(t1, 5) * t1
+    t2 = _sq_n(t1, 10) * t1
+    t2 = _sq_n(t2, 20) * t2
+    t1 = _sq_n(t2, 10) * t1
+    t2 = _sq_n(t1, 50) * t1
+    t2 = _sq_n(t2, 100) * t2
+    t1 = _sq_n(t2, 50) * t1
+    return _sq_n(t1, 5) * t0
+
+def chi25519_chain(z: fe25519) -> fe25519:
+    """
+    Method chain corresponding to :obj:`~fe25519.fe25519.fe25519.chi25519`.
+
+    >>> chi25519_chain(fe25519.one()) == fe25519.one()
+    True
+    """
+    t0 = z.sq()
+    t1 = t0 * z
+    t0 = t1.sq()
+    t2 = _sq_n(t0, 2) * t0
+    t1 = t2 * z
+    t1 = _sq_n(t1, 5) * t1
+    t2 = _sq_n(t1, 10) * t1
+    t2 = _sq_n(t2, 20) * t2
+    t1 = _sq_n(t2, 10) * t1
+    t2 = _sq_n(t1, 50) * t1
+    t2 = _sq_n(t2, 100) * t2
+    t1 = _sq_n(t2, 50) * t1
+    return _sq_n(t1, 4) * t0
+
+def sqrt_ratio_m1_ristretto255_chain(u: fe25519, v: fe25519) -> Tuple[fe25519, int]:
+    """
+    Method chain corresponding to
+    :obj:`~fe25519.fe25519.fe25519.sqrt_ratio_m1_ristretto255`.
+
+    >>> four = fe25519.one() + fe25519.one() + fe25519.one() + fe25519.one()
+    >>> (x, was_square) = sqrt_ratio_m1_ristretto255_chain(four, fe25519.one())
+    >>> (x == fe25519.one() + fe25519.one(), was_square)
+    (True, 1)
+    """
+    v3 = v.sq() * v                     # v3 = v^3
+    x = v3.sq() * v * u                 # x = uv^7
+    x = pow22523_chain(x) * v3 * u      # x = uv^3(uv^7)^((q-5)/8)
+    vxx = x.sq() * v                    # vx^2
+    has_m_root = (vxx - u).is_zero()
+    has_p_root = (vxx + u).is_zero()
+    has_f_root = (vxx + u * fe25519.sqrtm1).is_zero()
+    x = x.cmov(x * fe25519.sqrtm1, has_p_root | has_f_root)
+    return (abs(x), has_m_root | has_p_root)
+
+chains = {
+    'pow22523': pow22523_chain,
+    'invert': invert_chain,
+    'chi25519': chi25519_chain,
+    'sqrt_ratio_m1_ristretto255': sqrt_ratio_m1_ristretto255_chain
+}
+"""
+Method chains (built from the limb-based methods) against which the
+operations implemented using generated kernels are compared on ``'wide'``
+inputs.
+"""
+
+class operation: # pylint: disable=too-few-public-methods
+    """
+    Operation of the :obj:`~fe25519.fe25519.fe25519` class together with
+    its reference implementation.
+
+    The kinds of the arguments are specified using one character per
+    argument: ``'e'`` for an element, ``'b'`` for a bit, ``'i'`` for an
+    integer (which may be negative), and ``'k'`` for a 32-byte string. The
+    method is either the name of a method of the class (which is retrieved
+    when the operation is applied, so that the current backend is used) or
+    a function. The method of a batch operation is
+    applied to sequences of arguments (one sequence per argument) and must
+    return a list of results, whereas the reference implementation is
+    applied to one tuple of arguments at a time.
+
+    Elements in the ``'tight'`` domain have limbs below ``2**bits``.
+    Operations that are exact for ``'wide'`` inputs are compared with the
+    reference implementation for such inputs.
+    """
+    def __init__(
+            self: operation, kinds: str, method: Union[str, Callable[..., Any]],
+            oracle: Callable[..., Any], bits: int = 54, exact: bool = False,
+            batch: bool = False
+        ): # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.kinds = kinds
+        self.method = method
+        self.oracle = oracle
+        self.bits = bits
+        self.exact = exact
+        self.batch = batch
+
+    def __call__(self: operation, *args: Any) -> Any:
+        method = getattr(fe25519, self.method) if isinstance(self.method, str) else self.method
+        return method(*args)
+
+def _split(bs: bytes) -> List[bytes]:
+    """Split a concatenation of encodings into a list of encodings."""
+    return [bs[i:i + 32] for i in range(0, len(bs), 32)]
+
+operations = {
+    'reduce': operation('e', 'reduce', reference.reduce, exact=True),
+    'add': operation('ee', '__add__', reference.add),
+    'sub': operation('ee', '__sub__', reference.sub),
+    'neg': operation('e', '__neg__', reference.neg),
+    'abs': operation('e', '__abs__', reference.absolute),
+    'cmov': operation('eeb', 'cmov', reference.cmov, exact=True),
+    'cswap': operation('eeb', 'cswap', reference.cswap, exact=True),
+    'cneg': operation('eb', 'cneg', reference.cneg),
+    'mul': operation('ee', '__mul__', reference.mul),
+    'sq': operation('e', 'sq', reference.sq),
+    'sq2': operation('e', 'sq2', reference.sq2, bits=53),
+    'mul_add': operation('eee', 'mul_add', reference.mul_add, exact=True),
+    'mul_sub': operation('eee', 'mul_sub', reference.mul_sub, exact=True),
+    'sq_mul': operation('ee', 'sq_mul', reference.sq_mul, exact=True),
+    'sq_add': operation('ee', 'sq_add', reference.sq_add, exact=True),
+    'pow22523': operation('e', 'pow22523', reference.pow22523),
+    'invert': operation('e', 'invert', reference.invert),
+    'chi25519': operation('e', 'chi25519', reference.chi25519),
+    'sqrt_ratio_m1_ristretto255': operation(
+        'ee', 'sqrt_ratio_m1_ristretto255', reference.sqrt_ratio_m1_ristretto255
+    ),
+    'elligator2': operation('e', 'elligator2', reference.elligator2, bits=53),
+    'ladder_step': operation('eeeee', 'ladder_step', reference.ladder_step, bits=53),
+    'x25519': operation('kk', 'x25519', reference.x25519),
+    'is_zero': operation('e', 'is_zero', reference.is_zero, exact=True),
+    'is_negative': operation('e', 'is_negative', reference.is_negative, exact=True),
+    'eq': operation('ee', '__eq__', reference.eq, exact=True),
+    'to_bytes': operation('e', 'to_bytes', reference.to_bytes, exact=True),
+    'from_bytes': operation('k', 'from_bytes', reference.from_bytes, exact=True),
+    'to_int': operation('e', 'to_int', reference.reduce, exact=True),
+    'from_int': operation('i', 'from_int', reference.reduce, exact=True),
+    'to_hex': operation(
+        'e', 'to_hex', lambda a: reference.to_bytes(a).hex(), exact=True
+    ),
+    'from_hex': operation(
+        'k', lambda bs: fe25519.from_hex(bs.hex()), reference.from_bytes, exact=True
+    ),
+    'add_many': operation('ee', 'add_many', reference.add, batch=True),
+    'sub_many': operation('ee', 'sub_many', reference.sub, batch=True),
+    'mul_many': operation('ee', 'mul_many', reference.mul, batch=True),
+    'sq_many': operation('e', 'sq_many', reference.sq, batch=True),
+    'invert_many': operation('e', 'invert_many', reference.invert, batch=True),
+    'sqrt_ratio_m1_ristretto255_many': operation(
+        'ee', 'sqrt_ratio_m1_ristretto255_many', reference.sqrt_ratio_m1_ristretto255,
+        batch=True
+    ),
+    'elligator2_many': operation(
+        'e', 'elligator2_many', reference.elligator2, bits=53, batch=True
+    ),
+    'is_zero_many': operation(
+        'e', lambda xs: list(fe25519.is_zero_many(xs)), reference.is_zero,
+        exact=True, batch=True
+    ),
+    'is_negative_many': operation(
+        'e', lambda xs: list(fe25519.is_negative_many(xs)), reference.is_negative,
+        exact=True, batch=True
+    ),
+    'eq_many': operation(
+        'ee', lambda xs, ys: list(fe25519.eq_many(xs, ys)), reference.eq,
+        exact=True, batch=True
+    ),
+    'to_bytes_many': operation(
+        'e', lambda xs: _split(fe25519.to_bytes_many(xs)), reference.to_bytes,
+        exact=True, batch=True
+    ),
+    'from_bytes_many': operation(
+        'k', lambda bss: fe25519.from_bytes_many(b''.join(bss)), reference.from_bytes,
+        exact=True, batch=True
+    ),
+    'to_int_many': operation('e', 'to_int_many', reference.reduce, exact=True, batch=True),
+    'from_int_many': operation('i', 'from_int_many', reference.reduce, exact=True, batch=True)
+}
+"""Collection of all operations that are tested by the harness."""
+
+def _limbs(rng: random.Random, bits: int) -> List[int]:
+    """
+    Generate the limbs (each below ``2**bits``) of a pseudorandom (possibly
+    edge-case) element.
+    """
+    choice = rng.randrange(8)
+    if choice == 0:
+        top = 2 ** bits - 1
+        return list(rng.choice(_EDGES + [[top] * 5, [top, 0, 0, 0, 0], [0, 0, 0, 0, top]]))
+    if choice < 4 and bits < 64: # Canonical limbs.
+        n = rng.getrandbits(255) % reference.P
+        return [(n >> (51 * i)) & _MASK for i in range(5)]
+    return [rng.getrandbits(bits) >> rng.randrange(bits) for _ in range(5)]
+
+def _argument(rng: random.Random, kind: str, bits: int) -> Any:
+    """Generate a pseudorandom argument of the specified kind."""
+    if kind == 'e':
+        return fe25519(_limbs(rng, bits))
+    if kind == 'b':
+        return rng.getrandbits(1)
+    if kind == 'i':
+        if rng.randrange(8) == 0:
+            return rng.choice([0, -1, reference.P - 1, reference.P, 2 ** 255, -reference.P])
+        return rng.getrandbits(rng.randrange(1, 512)) * rng.choice([1, -1])
+    if rng.randrange(8) == 0:
+        return rng.choice(_ENCODINGS)
+    return rng.getrandbits(256).to_bytes(32, 'little')
+
+def _oracle_argument(argument: Any) -> Any:
+    """Convert an argument into the corresponding reference argument."""
+    return reference.value(argument.ns) if isinstance(argument, fe25519) else argument
+
+def _canonical(result: Any) -> Any:
+    """Convert a result into a form that can be compared with a reference result."""
+    if isinstance(result, fe25519):
+        return reference.value(result.ns) % reference.P
+    if isinstance(result, (tuple, list)):
+        return tuple(_canonical(r) for r in result)
+    return int(result) if isinstance(result, bool) else result
+
+class report: # pylint: disable=too-few-public-methods
+    """
+    Outcome of differential testing of one operation using one backend.
+    """
+    def __init__(
+            self: report, inputs: int, mismatches: int, seconds: float,
+            example: Optional[tuple] = None
+        ):
+        self.inputs = inputs
+        self.mismatches = mismatches
+        self.seconds = seconds
+        self.example = example # First arguments (if any) yielding a mismatch.
+
+    def throughput(self: report) -> float:
+        """
+        Number of inputs processed per second by the tested operation.
+        """
+        return self.inputs / self.seconds if self.seconds > 0 else float('inf')
+
+def _apply(entry: operation, rows: List[tuple]) -> List[Any]:
+    """Apply an operation to a block of argument tuples."""
+    if entry.batch:
+        return list(entry(*[list(column) for column in zip(*rows)]))
+    return [entry(*row) for row in rows]
+
+def covered(name: str, backend: str, domain: str) -> bool:
+    """
+    Determine whether the harness can test an operation using a backend
+    on inputs from a domain (*i.e.*, whether there is anything other than
+    the operation itself to compare it with).
+
+    >>> (covered('invert', 'limb', 'wide'), covered('mul', 'limb', 'wide'))
+    (True, False)
+    """
+    entry = operations[name]
+    if domain == 'wide':
+        if 'e' not in entry.kinds:
+            return False # Only elements can have wide limbs.
+        return entry.exact or name in chains or backend != 'limb'
+    return True
+
+def check( # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        name: str, backend: str = 'limb', count: int = 1000,
+        seed: int = 0, domain: str = 'tight', block: int = 64
+    ) -> report:
+    """
+    Compare the results of an operation (using the specified backend) with
+    those of its reference implementation on the specified number of
+    pseudorandom inputs. For ``'wide'`` inputs and an operation that is not
+    exact for such inputs, the results are instead compared with those of
+    the corresponding method chain (if there is one) or with those of the
+    ``'limb'`` backend. Batch operations are applied to blocks of inputs of
+    the specified size.
+
+    >>> r = check('mul', 'bigint', count=100)
+    >>> (r.inputs, r.mismatches)
+    (100, 0)
+    >>> check('mul', 'limb', domain='wide')
+    Traceback (most recent call last):
+      ...
+    ValueError: wide inputs of mul cannot be tested using the limb backend
+    """
+    if not covered(name, backend, domain):
+        raise ValueError(
+            domain + ' inputs of ' + name + ' cannot be tested using the ' +
+            backend + ' backend'
+        )
+    entry = operations[name]
+    (rng, wide) = (random.Random(f'{seed}:{name}:{domain}'), domain == 'wide')
+    bits = 64 if wide else entry.bits
+    previous = get_backend()
+    (mismatches, seconds, example) = (0, 0.0, None)
+    try:
+        for start in range(0, count, block):
+            rows = [
+                tuple(_argument(rng, kind, bits) for kind in entry.kinds)
+                for _ in range(min(block, count - start))
+            ]
+            if wide and not entry.exact:
+                set_backend('limb')
+                expected = [
+                    _canonical(result) for result in (
+                        [chains[name](*row) for row in rows] if name in chains
+                        else _apply(entry, rows)
+                    )
+                ]
+            else:
+                expected = [
+                    _canonical(entry.oracle(*map(_oracle_argument, row))) for row in rows
+                ]
+            set_backend(backend)
+            started = time.perf_counter()
+            results = _apply(entry, rows)
+            seconds += time.perf_counter() - started
+            for (row, result, expected_) in zip(rows, results, expected):
+                if _canonical(result) != expected_:
+                    mismatches += 1
+                    example = row if example is None else example
+    finally:
+        set_backend(previous)
+    return report(count, mismatches, seconds, example)
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    """
+    Run differential tests for the specified operations, backends, and
+    input domains, print a table of the results, and return the total
+    number of mismatches.
+
+    >>> main(['--count', '2', '--backends', 'limb', '--operations', 'mul']) # doctest: +ELLIPSIS
+    operation domain  backend    inputs mismatches      inputs/s
+    mul       tight   limb            2          0 ...
+    0
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', maxsplit=1)[0].strip())
+    parser.add_argument(
+        '--count', type=int, default=10000, help='number of inputs per operation'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='seed for generating inputs')
+    parser.add_argument(
+        '--backends', nargs='+', default=available_backends(), help='backends to test'
+    )
+    parser.add_argument(
+        '--operations', nargs='+', default=list(operations), help='operations to test'
+    )
+    parser.add_argument(
+        '--domains', nargs='+', default=['tight', 'wide'], choices=['tight', 'wide'],
+        help='input domains to test'
+    )
+    args = parser.parse_args(arguments)
+
+    width = max(len('operation'), *(len(name) for name in args.operations))
+    print(' '.join([
+        'operation'.ljust(width), 'domain ', 'backend'.ljust(8),
+        'inputs'.rjust(8), 'mismatches'.rjust(10), 'inputs/s'.rjust(13)
+    ]))
+    total = 0
+    for name in args.operations:
+        for domain in args.domains:
+            for backend in args.backends:
+                if not covered(name, backend, domain):
+                    continue
+                r = check(name, backend, args.count, args.seed, domain)
+                total += r.mismatches
+                print(' '.join([
+                    name.ljust(width), domain.ljust(7), backend.ljust(8),
+                    str(r.inputs).rjust(8), str(r.mismatches).rjust(10),
+                    f'{r.throughput():.0f}'.rjust(13)
+                ]))
+                if r.example is not None:
+                    print(f'  first mismatch: {r.example!r}')
+    return total
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0) # pragma: no cover
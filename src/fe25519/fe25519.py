@@ -3,11 +3,36 @@ Pure-Python data structure for working with Ed25519 (and Ristretto)
 field elements and operations.
 """
 from __future__ import annotations
-from typing import Tuple, Sequence
+from typing import Callable, Tuple, List, Sequence, TYPE_CHECKING
 import doctest
 
+try:
+    from fe25519.kernels import kernels
+except ImportError: # pragma: no cover
+    from kernels import kernels # Module is being executed directly.
+
+if TYPE_CHECKING: # pragma: no cover
+    from fe25519.powers import power_table # The powers module depends on this one.
+
 _TWO_TO_64 = 2 ** 64
 _TWO_TO_128 = 2 ** 128
+_P = 2 ** 255 - 19
+
+def _canonical(ns: Sequence[int]) -> int:
+    """
+    Compute the canonical integer corresponding to a sequence of limbs (this
+    is identical to the value obtained from the output of
+    :obj:`~fe25519.fe25519.fe25519.reduce` for all limbs below ``2**64``).
+    """
+    return (ns[0] + (ns[1] << 51) + (ns[2] << 102) + (ns[3] << 153) + (ns[4] << 204)) % _P
+
+def _limbs(n: int) -> List[int]:
+    """
+    Split a non-negative integer into five 51-bit limbs (ignoring any bits
+    of the integer beyond the first 255).
+    """
+    mask = 2251799813685247
+    return [n & mask, (n >> 51) & mask, (n >> 102) & mask, (n >> 153) & mask, (n >> 204) & mask]
 
 class fe25519:
     """
@@ -17,6 +42,7 @@ class fe25519:
     However, use of some built-in Python operators is supported via
     special methods.
     """
+    # pylint: disable=too-many-public-methods
     # Precomputed static constants.
     d = None
     d2 = None
@@ -67,7 +93,7 @@ class fe25519:
         >>> (~fe25519.one()).reduce()
         fe25519([1, 0, 0, 0, 0])
         """
-        t = self.ns # 128-bit integers.
+        t = list(self.ns) # 128-bit integers (copied so that this element is unchanged).
         mask = 2251799813685247
 
         t[1] = (t[1] + (t[0] >> 51)) % _TWO_TO_128
@@ -137,6 +163,8 @@ class fe25519:
         >>> fe25519.zero() + fe25519.zero() == fe25519.zero()
         True
         """
+        if not isinstance(other, fe25519):
+            return NotImplemented # Allow other classes to support this operator.
         return fe25519([(m+n)%_TWO_TO_64 for (m, n) in zip(self.ns, other.ns)])
 
     def __neg__(self: fe25519) -> fe25519:
@@ -154,6 +182,24 @@ class fe25519:
         pairs = zip(self.ns, g.ns)
         return fe25519([fi ^ ((fi ^ gi) & mask) for (fi, gi) in pairs])
 
+    @staticmethod
+    def cswap(f: fe25519, g: fe25519, b: int) -> Tuple[fe25519, fe25519]:
+        """
+        Conditionally swap two elements based on a boolean integer.
+
+        >>> (zero, one) = (fe25519.zero(), fe25519.one())
+        >>> fe25519.cswap(zero, one, 0) == (zero, one)
+        True
+        >>> fe25519.cswap(zero, one, 1) == (one, zero)
+        True
+        """
+        mask = _TWO_TO_64 - b
+        xs = [(fi ^ gi) & mask for (fi, gi) in zip(f.ns, g.ns)]
+        return (
+            fe25519([fi ^ x for (fi, x) in zip(f.ns, xs)]),
+            fe25519([gi ^ x for (gi, x) in zip(g.ns, xs)])
+        )
+
     def cneg(self: fe25519, b: int) -> fe25519:
         """
         Compute the conditional negation of this element.
@@ -181,6 +227,8 @@ class fe25519:
         >>> fe25519.zero() - fe25519.one() == fe25519.one().cneg(1)
         True
         """
+        if not isinstance(other, fe25519):
+            return NotImplemented # Allow other classes to support this operator.
         mask = 2251799813685247
 
         (h0, h1, h2, h3, h4) = other.ns
@@ -211,6 +259,8 @@ class fe25519:
         >>> fe25519.one() * fe25519.zero() == fe25519.zero()
         True
         """
+        if not isinstance(other, fe25519):
+            return NotImplemented # Allow other classes to support this operator.
         mask = 2251799813685247 # 64-bit integer.
         (f, g) = (self.ns, other.ns) # 64-bit integers.
         r = [None, None, None, None, None] # 128-bit integers.
@@ -358,50 +408,56 @@ class fe25519:
 
         return fe25519(r0)
 
+    def mul_add(self: fe25519, other: fe25519, addend: fe25519) -> fe25519:
+        """
+        Compute the product of this element and another element plus a
+        third element (using a single carry chain).
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> two.mul_add(two, fe25519.one()) == two * two + fe25519.one()
+        True
+        """
+        return fe25519(kernels().mul_add(*self.ns, *other.ns, *addend.ns))
+
+    def mul_sub(self: fe25519, other: fe25519, subtrahend: fe25519) -> fe25519:
+        """
+        Compute the product of this element and another element minus a
+        third element (using a single carry chain).
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> fe25519.one().mul_sub(fe25519.one(), two) == -fe25519.one()
+        True
+        """
+        return fe25519(kernels().mul_sub(*self.ns, *other.ns, *subtrahend.ns))
+
+    def sq_mul(self: fe25519, other: fe25519) -> fe25519:
+        """
+        Compute the product of the square of this element and another
+        element (without constructing the intermediate square).
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> two.sq_mul(two) == two.sq() * two
+        True
+        """
+        return fe25519(kernels().sq_mul(*self.ns, *other.ns))
+
+    def sq_add(self: fe25519, addend: fe25519) -> fe25519:
+        """
+        Compute the square of this element plus another element (using a
+        single carry chain).
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> two.sq_add(two) == two.sq() + two
+        True
+        """
+        return fe25519(kernels().sq_add(*self.ns, *addend.ns))
+
     def pow22523(self: fe25519) -> fe25519:
         """
         Compute the result of the exponentiation of this element by a
         special fixed exponent.
         """
-        z = self.copy()
-        t0 = z.sq()
-        t1 = t0.sq()
-        t1 = t1.sq()
-        t1 = z * t1
-        t0 = t0 * t1
-        t0 = t0.sq()
-        t0 = t1 * t0
-        t1 = t0.sq()
-        for _ in range(1, 5):
-            t1 = t1.sq()
-        t0 = t1 * t0
-        t1 = t0.sq()
-        for _ in range(1, 10):
-            t1 = t1.sq()
-        t1 = t1 * t0
-        t2 = t1.sq()
-        for _ in range(1, 20):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t1 = t1.sq()
-        for _ in range(1, 10):
-            t1 = t1.sq()
-        t0 = t1 * t0
-        t1 = t0.sq()
-        for _ in range(1, 50):
-            t1 = t1.sq()
-        t1 = t1 * t0
-        t2 = t1.sq()
-        for _ in range(1, 100):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t1 = t1.sq()
-        for _ in range(1, 50):
-            t1 = t1.sq()
-        t0 = t1 * t0
-        t0 = t0.sq()
-        t0 = t0.sq()
-        return t0 * z
+        return fe25519(kernels().pow22523(*self.ns))
 
     def invert(self: fe25519) -> fe25519:
         """
@@ -411,46 +467,7 @@ class fe25519:
         >>> (two.invert() * two).reduce() == fe25519.one()
         True
         """
-        z = self.copy()
-        t0 = z.sq()
-        t1 = t0.sq()
-        t1 = t1.sq()
-        t1 = z * t1
-        t0 = t0 * t1
-        t2 = t0.sq()
-        t1 = t1 * t2
-        t2 = t1.sq()
-        for _ in range(1, 5):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t2 = t1.sq()
-        for _ in range(1, 10):
-            t2 = t2.sq()
-        t2 = t2 * t1
-        t3 = t2.sq()
-        for _ in range(1, 20):
-            t3 = t3.sq()
-        t2 = t3 * t2
-        t2 = t2.sq()
-        for _ in range(1, 10):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t2 = t1.sq()
-        for _ in range(1, 50):
-            t2 = t2.sq()
-        t2 = t2 * t1
-        t3 = t2.sq()
-        for _ in range(1, 100):
-            t3 = t3.sq()
-        t2 = t3 * t2
-        t2 = t2.sq()
-        for _ in range(1, 50):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t1 = t1.sq()
-        for _ in range(1, 5):
-            t1 = t1.sq()
-        return t1 * t0
+        return fe25519(kernels().invert(*self.ns))
 
     def __invert__(self: fe25519) -> fe25519:
         """
@@ -480,94 +497,226 @@ class fe25519:
         # Supplied exponent is not supported.
         return None
 
+    def fixed_base(self: fe25519, window: int = 4, bits: int = 255) -> power_table:
+        """
+        Precompute a table of powers of this element (see
+        :obj:`fe25519.powers`) that can be used to raise this element to any
+        exponent below ``2**bits`` using only multiplications.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> two.fixed_base().pow(3) == two * two * two
+        True
+        """
+        try:
+            from fe25519.powers import power_table # pylint: disable=import-outside-toplevel
+        except ImportError: # pragma: no cover
+            from powers import power_table # pylint: disable=import-outside-toplevel
+        return power_table(self, window, bits)
+
     def sqrt_ratio_m1_ristretto255(self: fe25519, v: fe25519) -> Tuple[fe25519, int]:
         """
         Compute the result of a specialized root operation.
         """
-        u = self
+        (ns, was_square) = kernels().sqrt_ratio_m1_ristretto255(*self.ns, *v.ns)
+        return (fe25519(ns), was_square)
 
-        v3 = v.sq()
-        v3 = v3 * v                         # v3 = v^3
-        x = v3.sq()
-        x = x * v
-        x = x * u                           # x = uv^7
+    def chi25519(self: fe25519) -> fe25519:
+        """
+        Compute the result of a specialized root operation (for elligator).
+        """
+        return fe25519(kernels().chi25519(*self.ns))
+
+    def elligator2(self: fe25519) -> fe25519:
+        """
+        Map this element to the u-coordinate of a point on Curve25519 using
+        the Elligator 2 map (as in libsodium and with ``Z = 2`` as in
+        `RFC 9380 <https://www.rfc-editor.org/rfc/rfc9380#section-6.7.1>`__),
+        avoiding data-dependent branches.
+
+        >>> u = fe25519.one().elligator2()
+        >>> (u.sq_mul(u) + u.sq() * fe25519.curve25519_A + u).chi25519() == fe25519.one()
+        True
+        """
+        a = fe25519.curve25519_A
+        x = -(a * (self.sq2() + fe25519.one()).invert()) # x = -A/(1+2r^2)
+        x2 = x.sq()
+        e = x2.mul_add(x, x) + x2 * a                    # e = x^3+Ax^2+x
+        e_is_minus_1 = e.chi25519().to_bytes()[1] & 1
+        x = x.cmov(-x, e_is_minus_1)
+        return x - fe25519.zero().cmov(a, e_is_minus_1)  # x or -x-A
 
-        x = x.pow22523()                    # x = (uv^7)^((q-5)/8)
-        x = x * v3
-        x = x * u                           # x = uv^3(uv^7)^((q-5)/8)
+    @staticmethod
+    def elligator2_many(rs: Sequence[fe25519]) -> List[fe25519]:
+        """
+        Compute the results of :obj:`elligator2` for all elements in a
+        sequence using a single (batch) inversion. Unlike :obj:`elligator2`,
+        this method determines quadratic residuosity using variable-time
+        integer exponentiation, so it should only be applied to public inputs.
 
-        vxx = x.sq()
-        vxx = vxx * v                       # vx^2
-        m_root_check = vxx - u              # vx^2-u
-        p_root_check = vxx + u              # vx^2+u
-        f_root_check = u * fe25519.sqrtm1   # u*sqrt(-1)
-        f_root_check = vxx + f_root_check   # vx^2+u*sqrt(-1)
-        has_m_root = m_root_check.is_zero()
-        has_p_root = p_root_check.is_zero()
-        has_f_root = f_root_check.is_zero()
-        x_sqrtm1 = x * fe25519.sqrtm1       # x*sqrt(-1)
+        >>> rs = [fe25519.one(), fe25519.one() + fe25519.one()]
+        >>> fe25519.elligator2_many(rs) == [r.elligator2() for r in rs]
+        True
+        """
+        (a, one) = (fe25519.curve25519_A, fe25519.one())
+        ds = fe25519.invert_many([r.sq2() + one for r in rs])
+        us = []
+        for d in ds:
+            x = -(a * d)
+            e = x.mul_add(x + a, one) * x
+            square = pow(_canonical(e.ns), (_P - 1) // 2, _P) != _P - 1
+            us.append(x if square else -x - a)
+        return us
 
-        x = x.cmov(x_sqrtm1, has_p_root | has_f_root)
-        x = abs(x)
+    @staticmethod
+    def ladder_step(
+            x1: fe25519, x2: fe25519, z2: fe25519, x3: fe25519, z3: fe25519
+        ) -> Tuple[fe25519, fe25519, fe25519, fe25519]:
+        """
+        Compute a combined differential addition and doubling step of the
+        Montgomery ladder for Curve25519 (as specified in
+        `RFC 7748 <https://www.rfc-editor.org/rfc/rfc7748#section-5>`__),
+        returning the updated coordinates ``(x2, z2, x3, z3)``.
+
+        >>> (zero, one) = (fe25519.zero(), fe25519.one())
+        >>> u = one + one + one + one + one + one + one + one + one
+        >>> (x2, z2, x3, z3) = fe25519.ladder_step(u, one, zero, u, one)
+        >>> z2 == fe25519.zero() and (x3 * ~z3) == u
+        True
+        """
+        (x2, z2, x3, z3) = kernels().ladder_step(*x1.ns, *x2.ns, *z2.ns, *x3.ns, *z3.ns)
+        return (fe25519(x2), fe25519(z2), fe25519(x3), fe25519(z3))
 
-        return (x, has_m_root | has_p_root)
+    @staticmethod
+    def x25519(scalar: bytes, u: bytes) -> bytes:
+        """
+        Compute the X25519 function (as specified in
+        `RFC 7748 <https://www.rfc-editor.org/rfc/rfc7748#section-5>`__)
+        on a 32-byte scalar and the 32-byte encoding of a u-coordinate. The
+        Montgomery ladder keeps all coordinates in local variables and
+        performs a single inversion at the end.
 
-    def chi25519(self: fe25519) -> fe25519:
+        >>> base = bytes([9] + [0] * 31)
+        >>> fe25519.x25519(base, base).hex()
+        '422c8e7a6227d7bca1350b3e2bb7279f7897b87bb6854b783c60e80311ae3079'
+        >>> fe25519.x25519(base, bytes(31))
+        Traceback (most recent call last):
+          ...
+        ValueError: scalar and u-coordinate must each consist of 32 bytes
         """
-        Compute the result of a specialized root operation (for elligator).
+        if len(scalar) != 32 or len(u) != 32:
+            raise ValueError('scalar and u-coordinate must each consist of 32 bytes')
+
+        k = int.from_bytes(scalar, 'little')
+        k = (k & ((1 << 254) - 8)) | (1 << 254) # Clamp the scalar.
+        return fe25519(kernels().x25519(k, *fe25519.from_bytes(u).ns)).to_bytes()
+
+    @staticmethod
+    def add_many(xs: Sequence[fe25519], ys: Sequence[fe25519]) -> List[fe25519]:
+        """
+        Compute the sums of corresponding pairs of elements in two sequences.
+
+        >>> one = fe25519.one()
+        >>> fe25519.add_many([one, one], [one, one]) == [one + one, one + one]
+        True
+        """
+        return [x + y for (x, y) in zip(xs, ys)]
+
+    @staticmethod
+    def sub_many(xs: Sequence[fe25519], ys: Sequence[fe25519]) -> List[fe25519]:
+        """
+        Compute the differences of corresponding pairs of elements in two
+        sequences.
+
+        >>> one = fe25519.one()
+        >>> [f.is_zero() for f in fe25519.sub_many([one, one], [one, one])]
+        [1, 1]
+        """
+        return [x - y for (x, y) in zip(xs, ys)]
+
+    @staticmethod
+    def mul_many(xs: Sequence[fe25519], ys: Sequence[fe25519]) -> List[fe25519]:
+        """
+        Compute the products of corresponding pairs of elements in two
+        sequences.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> fe25519.mul_many([two], [two]) == [two * two]
+        True
+        """
+        return [x * y for (x, y) in zip(xs, ys)]
+
+    @staticmethod
+    def sq_many(xs: Sequence[fe25519]) -> List[fe25519]:
         """
-        t0 = self.sq()
-        t1 = t0 * self
-        t0 = t1.sq()
-        t2 = t0.sq()
-        t2 = t2.sq()
-        t2 = t2 * t0
-        t1 = t2 * self
-        t2 = t1.sq()
-
-        for _ in range(1, 5):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t2 = t1.sq()
-        for _ in range(1, 10):
-            t2 = t2.sq()
-        t2 = t2 * t1
-        t3 = t2.sq()
-        for _ in range(1, 20):
-            t3 = t3.sq()
-        t2 = t3 * t2
-        t2 = t2.sq()
-        for _ in range(1, 10):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t2 = t1.sq()
-        for _ in range(1, 50):
-            t2 = t2.sq()
-        t2 = t2 * t1
-        t3 = t2.sq()
-        for _ in range(1, 100):
-            t3 = t3.sq()
-        t2 = t3 * t2
-        t2 = t2.sq()
-        for _ in range(1, 50):
-            t2 = t2.sq()
-        t1 = t2 * t1
-        t1 = t1.sq()
-        for _ in range(1, 4):
-            t1 = t1.sq()
-
-        return t1 * t0
+        Compute the squares of all elements in a sequence.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> fe25519.sq_many([two]) == [two.sq()]
+        True
+        """
+        return [x.sq() for x in xs]
+
+    @staticmethod
+    def invert_many(xs: Sequence[fe25519]) -> List[fe25519]:
+        """
+        Compute the multiplicative inverses of all elements in a sequence
+        using a single inversion (via Montgomery's trick). As with
+        :obj:`invert`, the inverse of zero is zero.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> [f.to_bytes() for f in fe25519.invert_many([two, fe25519.zero(), two])] == \\
+        ...     [two.invert().to_bytes(), bytes(32), two.invert().to_bytes()]
+        True
+        """
+        (one, zero) = (fe25519.one(), fe25519.zero())
+        zs = [x.is_zero() for x in xs]
+        xs = [x.cmov(one, z) for (x, z) in zip(xs, zs)]
+
+        # Compute all prefix products, invert the last one, and then
+        # recover each inverse while unwinding the prefix products.
+        ps = [one]
+        for x in xs:
+            ps.append(ps[-1] * x)
+        inverse = ps[-1].invert()
+        rs = [None] * len(xs)
+        for i in range(len(xs) - 1, -1, -1):
+            rs[i] = (inverse * ps[i]).cmov(zero, zs[i])
+            inverse = inverse * xs[i]
+
+        return rs
+
+    @staticmethod
+    def sqrt_ratio_m1_ristretto255_many(
+            us: Sequence[fe25519], vs: Sequence[fe25519]
+        ) -> List[Tuple[fe25519, int]]:
+        """
+        Compute the results of
+        :obj:`sqrt_ratio_m1_ristretto255` for all pairs of corresponding
+        elements in two sequences. Backends may override this method in
+        order to share work across the batch.
+
+        >>> (one, two) = (fe25519.one(), fe25519.one() + fe25519.one())
+        >>> fe25519.sqrt_ratio_m1_ristretto255_many([one, two], [one, one]) == \\
+        ...     [one.sqrt_ratio_m1_ristretto255(one), two.sqrt_ratio_m1_ristretto255(one)]
+        True
+        """
+        return [u.sqrt_ratio_m1_ristretto255(v) for (u, v) in zip(us, vs)]
 
     def __eq__(self: fe25519, other: fe25519) -> bool:
         """
-        Determine whether this element and another are equivalent.
+        Determine whether this element and another are equivalent (*i.e.*,
+        whether their canonical representations are equal).
 
         >>> fe25519.zero() == fe25519.one()
         False
         >>> fe25519.one() == fe25519.one()
         True
+        >>> fe25519([2251799813685230] + [2251799813685247] * 4) == fe25519.one()
+        True
         """
-        return self.ns == other.ns
+        if not isinstance(other, fe25519):
+            return NotImplemented # Allow other classes to support this operator.
+        return self.ns == other.ns or self.reduce().ns == other.reduce().ns
 
     def is_zero(self: fe25519) -> int:
         """
@@ -594,6 +743,42 @@ class fe25519:
         bs = self.to_bytes()
         return bs[0] & 1
 
+    @staticmethod
+    def is_zero_many(xs: Sequence[fe25519]) -> bytes:
+        """
+        Determine which elements in a sequence are zero, returning a byte
+        vector that holds the result of :obj:`is_zero` for each element.
+
+        >>> fe25519.is_zero_many([fe25519.zero(), fe25519.one()])
+        b'\\x01\\x00'
+        """
+        return bytes(_canonical(x.ns) == 0 for x in xs)
+
+    @staticmethod
+    def is_negative_many(xs: Sequence[fe25519]) -> bytes:
+        """
+        Determine which elements in a sequence have the negation bit set,
+        returning a byte vector that holds the result of :obj:`is_negative`
+        for each element.
+
+        >>> fe25519.is_negative_many([fe25519.one(), -fe25519.one()])
+        b'\\x01\\x00'
+        """
+        return bytes(_canonical(x.ns) & 1 for x in xs)
+
+    @staticmethod
+    def eq_many(xs: Sequence[fe25519], ys: Sequence[fe25519]) -> bytes:
+        """
+        Determine which pairs of corresponding elements in two sequences are
+        equivalent, returning a byte vector that holds the result of
+        :obj:`__eq__` for each pair.
+
+        >>> (zero, one) = (fe25519.zero(), fe25519.one())
+        >>> fe25519.eq_many([zero, one], [zero, zero])
+        b'\\x01\\x00'
+        """
+        return bytes(_canonical(x.ns) == _canonical(y.ns) for (x, y) in zip(xs, ys))
+
     @staticmethod
     def from_bytes(bs: bytes) -> fe25519:
         """
@@ -654,6 +839,140 @@ class fe25519:
         """
         return self.to_bytes()
 
+    @staticmethod
+    def from_bytes_many(bs: bytes) -> List[fe25519]:
+        """
+        Assemble a list of element instances from a contiguous sequence of
+        their byte representations (each consisting of 32 bytes).
+
+        >>> fe25519.from_bytes_many(bytes([1] + [0] * 31) * 2)
+        [fe25519([1, 0, 0, 0, 0]), fe25519([1, 0, 0, 0, 0])]
+        >>> fe25519.from_bytes_many(bytes(33))
+        Traceback (most recent call last):
+          ...
+        ValueError: length of byte vector must be a multiple of 32
+        """
+        if len(bs) % 32 != 0:
+            raise ValueError('length of byte vector must be a multiple of 32')
+
+        view = memoryview(bs)
+        return [
+            fe25519(_limbs(int.from_bytes(view[i:i + 32], 'little')))
+            for i in range(0, len(bs), 32)
+        ]
+
+    @staticmethod
+    def to_bytes_many(fs: Sequence[fe25519]) -> bytes:
+        """
+        Build a contiguous sequence of the byte representations of all
+        elements in a sequence.
+
+        >>> fe25519.to_bytes_many([fe25519.one()] * 2).hex()[:66]
+        '010000000000000000000000000000000000000000000000000000000000000001'
+        """
+        bs = bytearray(32 * len(fs))
+        for (i, f) in enumerate(fs):
+            t = f.reduce().ns
+            w = t[0] | (t[1] << 51) | (t[2] << 102) | (t[3] << 153) | (t[4] << 204)
+            bs[32 * i:32 * (i + 1)] = w.to_bytes(32, 'little')
+        return bytes(bs)
+
+    @staticmethod
+    def from_int(n: int) -> fe25519:
+        """
+        Create an element from an integer (which is reduced modulo
+        ``p = 2**255 - 19``).
+
+        >>> fe25519.from_int(1)
+        fe25519([1, 0, 0, 0, 0])
+        >>> fe25519.from_int(-1) == -fe25519.one()
+        True
+        """
+        return fe25519(_limbs(n % _P))
+
+    def to_int(self: fe25519) -> int:
+        """
+        Compute the canonical integer (*i.e.*, the integer below
+        ``p = 2**255 - 19``) corresponding to this element.
+
+        >>> fe25519.one().to_int()
+        1
+        >>> (-fe25519.one()).to_int() == 2 ** 255 - 20
+        True
+        """
+        return _canonical(self.ns)
+
+    @staticmethod
+    def from_int_many(ns: Sequence[int]) -> List[fe25519]:
+        """
+        Create a list of elements from a sequence of integers (using
+        :obj:`from_int`).
+
+        >>> fe25519.from_int_many([0, 1]) == [fe25519.zero(), fe25519.one()]
+        True
+        """
+        return [fe25519.from_int(n) for n in ns]
+
+    @staticmethod
+    def to_int_many(fs: Sequence[fe25519]) -> List[int]:
+        """
+        Compute the canonical integers corresponding to all elements in a
+        sequence (using :obj:`to_int`).
+
+        >>> fe25519.to_int_many([fe25519.zero(), fe25519.one()])
+        [0, 1]
+        """
+        return [f.to_int() for f in fs]
+
+    @staticmethod
+    def from_hex(s: str) -> fe25519:
+        """
+        Assemble an element instance from the hexadecimal string
+        representation of its byte representation (consistent with
+        :obj:`from_bytes`).
+
+        >>> fe25519.from_hex('01' + '00' * 31)
+        fe25519([1, 0, 0, 0, 0])
+        >>> fe25519.from_hex('01')
+        Traceback (most recent call last):
+          ...
+        ValueError: hexadecimal string must represent 32 bytes
+        """
+        bs = bytes.fromhex(s)
+        if len(bs) != 32:
+            raise ValueError('hexadecimal string must represent 32 bytes')
+
+        return fe25519(_limbs(int.from_bytes(bs, 'little')))
+
+    def to_hex(self: fe25519) -> str:
+        """
+        Build the hexadecimal string representation of the byte
+        representation of this element.
+
+        >>> fe25519.one().to_hex()
+        '0100000000000000000000000000000000000000000000000000000000000000'
+        """
+        return self.to_int().to_bytes(32, 'little').hex()
+
+    def __reduce__(self: fe25519) -> Tuple[Callable[..., fe25519], tuple]:
+        """
+        Support compact pickling of instances using their canonical byte
+        representations. Elements having limbs that are not below ``2**53``
+        (which the methods of this class never produce) are instead pickled
+        using their limbs, as arithmetic on such elements (starting with
+        :obj:`sq2`, which wraps for limbs near ``2**54``) depends on more
+        than just the elements' values.
+
+        >>> import pickle
+        >>> pickle.loads(pickle.dumps(fe25519.one())) == fe25519.one()
+        True
+        >>> pickle.loads(pickle.dumps(fe25519([2 ** 64 - 1] * 5))).ns == [2 ** 64 - 1] * 5
+        True
+        """
+        if max(self.ns) < 9007199254740992:
+            return (fe25519.from_bytes, (self.to_bytes(),))
+        return (fe25519, (list(self.ns),))
+
     def __str__(self: fe25519) -> str:
         """
         Obtain the string representation of an element.
@@ -0,0 +1,251 @@
+"""
+Projective representation of field elements as fractions that support
+arithmetic (including division) without inversions.
+
+A fraction is a pair consisting of a numerator and a denominator (both
+instances of :obj:`~fe25519.fe25519.fe25519`). Inversion is deferred until
+the value of a fraction must be determined (*e.g.*, by
+:obj:`~fe25519_fraction.to_bytes`) and can be shared between many
+fractions using :obj:`~fe25519_fraction.normalize_many`. Consistent with
+:obj:`~fe25519.fe25519.fe25519.invert`, a fraction that has a zero
+denominator has the value zero.
+
+>>> (one, two) = (fe25519_fraction(fe25519.one()), fe25519.one() + fe25519.one())
+>>> (one / two + one / two).normalize() == fe25519.one()
+True
+"""
+from __future__ import annotations
+from typing import List, Optional, Sequence, Tuple, Union
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+
+class fe25519_fraction:
+    """
+    Class for creating and operating on field elements that are represented
+    as fractions. Operands of arithmetic operators (on either side) may also
+    be instances of :obj:`~fe25519.fe25519.fe25519`.
+    """
+    def __init__(
+            self: fe25519_fraction, numerator: fe25519, denominator: Optional[fe25519] = None
+        ):
+        """Create a fraction from a numerator and a denominator (one by default)."""
+        self.numerator = numerator
+        self.denominator = fe25519.one() if denominator is None else denominator
+
+    @staticmethod
+    def _fraction(other: Union[fe25519_fraction, fe25519]) -> fe25519_fraction:
+        """Convert an operand into a fraction (if it is not one already)."""
+        return other if isinstance(other, fe25519_fraction) else fe25519_fraction(other)
+
+    def _canonical(self: fe25519_fraction) -> Tuple[fe25519, fe25519]:
+        """
+        Return a numerator and a nonzero denominator that represent the value
+        of this fraction (replacing a zero denominator with ``0/1`` without
+        any branches), as required by sums and differences.
+        """
+        z = self.denominator.is_zero()
+        return (
+            self.numerator.cmov(fe25519.zero(), z),
+            self.denominator.cmov(fe25519.one(), z)
+        )
+
+    def __add__(
+            self: fe25519_fraction, other: Union[fe25519_fraction, fe25519]
+        ) -> fe25519_fraction:
+        """
+        Compute the sum of this fraction and another fraction.
+
+        >>> one = fe25519_fraction(fe25519.one())
+        >>> (one + one).normalize() == fe25519.one() + fe25519.one()
+        True
+        """
+        ((a, b), (c, d)) = (self._canonical(), fe25519_fraction._fraction(other)._canonical())
+        return fe25519_fraction(a.mul_add(d, c * b), b * d)
+
+    def __radd__(self: fe25519_fraction, other: fe25519) -> fe25519_fraction:
+        """
+        Compute the sum of an element and this fraction.
+
+        >>> (fe25519.one() + fe25519_fraction(fe25519.one())).normalize() == \\
+        ...     fe25519.one() + fe25519.one()
+        True
+        """
+        return fe25519_fraction._fraction(other) + self
+
+    def __neg__(self: fe25519_fraction) -> fe25519_fraction:
+        """
+        Compute the negation of this fraction.
+
+        >>> (-fe25519_fraction(fe25519.one())).normalize() == -fe25519.one()
+        True
+        """
+        return fe25519_fraction(-self.numerator, self.denominator)
+
+    def __sub__(
+            self: fe25519_fraction, other: Union[fe25519_fraction, fe25519]
+        ) -> fe25519_fraction:
+        """
+        Compute the result of subtracting another fraction from this fraction.
+
+        >>> one = fe25519_fraction(fe25519.one())
+        >>> (one - one).is_zero()
+        1
+        """
+        ((a, b), (c, d)) = (self._canonical(), fe25519_fraction._fraction(other)._canonical())
+        return fe25519_fraction(a.mul_sub(d, c * b), b * d)
+
+    def __rsub__(self: fe25519_fraction, other: fe25519) -> fe25519_fraction:
+        """
+        Compute the result of subtracting this fraction from an element.
+
+        >>> (fe25519.one() - fe25519_fraction(fe25519.one())).is_zero()
+        1
+        """
+        return fe25519_fraction._fraction(other) - self
+
+    def __mul__(
+            self: fe25519_fraction, other: Union[fe25519_fraction, fe25519]
+        ) -> fe25519_fraction:
+        """
+        Compute the product of this fraction and another fraction.
+
+        >>> two = fe25519_fraction(fe25519.one() + fe25519.one())
+        >>> (two * two).normalize() == (fe25519.one() + fe25519.one()).sq()
+        True
+        """
+        other = fe25519_fraction._fraction(other)
+        return fe25519_fraction(
+            self.numerator * other.numerator,
+            self.denominator * other.denominator
+        )
+
+    def __rmul__(self: fe25519_fraction, other: fe25519) -> fe25519_fraction:
+        """
+        Compute the product of an element and this fraction.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> (two * fe25519_fraction(two)).normalize() == two.sq()
+        True
+        """
+        return fe25519_fraction._fraction(other) * self
+
+    def __truediv__(
+            self: fe25519_fraction, other: Union[fe25519_fraction, fe25519]
+        ) -> fe25519_fraction:
+        """
+        Compute the quotient of this fraction and another fraction. As with
+        :obj:`~fe25519.fe25519.fe25519.invert`, division by zero yields zero.
+
+        >>> two = fe25519_fraction(fe25519.one() + fe25519.one())
+        >>> (two / two).normalize() == fe25519.one()
+        True
+        >>> (two / fe25519.zero()).is_zero()
+        1
+        """
+        other = fe25519_fraction._fraction(other)
+        return fe25519_fraction(
+            self.numerator * other.denominator,
+            self.denominator * other.numerator
+        )
+
+    def __rtruediv__(self: fe25519_fraction, other: fe25519) -> fe25519_fraction:
+        """
+        Compute the quotient of an element and this fraction.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> (fe25519.one() / fe25519_fraction(two)).normalize() == two.invert()
+        True
+        """
+        return fe25519_fraction._fraction(other) / self
+
+    def normalize(self: fe25519_fraction) -> fe25519:
+        """
+        Compute the element that is the value of this fraction (using a
+        single inversion).
+
+        >>> fe25519_fraction(fe25519.one(), fe25519.one() + fe25519.one()).normalize() == \\
+        ...     (fe25519.one() + fe25519.one()).invert()
+        True
+        """
+        return self.numerator * self.denominator.invert()
+
+    @staticmethod
+    def normalize_many(fractions: Sequence[fe25519_fraction]) -> List[fe25519]:
+        """
+        Compute the elements that are the values of all fractions in a
+        sequence (using a single batch inversion via
+        :obj:`~fe25519.fe25519.fe25519.invert_many`).
+
+        >>> half = fe25519_fraction(fe25519.one(), fe25519.one() + fe25519.one())
+        >>> fe25519_fraction.normalize_many([half, half]) == [half.normalize()] * 2
+        True
+        """
+        inverses = fe25519.invert_many([f.denominator for f in fractions])
+        return [f.numerator * inverse for (f, inverse) in zip(fractions, inverses)]
+
+    def is_zero(self: fe25519_fraction) -> int:
+        """
+        Determine whether this fraction is zero (without any inversion).
+
+        >>> fe25519_fraction(fe25519.zero(), fe25519.one()).is_zero()
+        1
+        >>> fe25519_fraction(fe25519.one(), fe25519.one()).is_zero()
+        0
+        """
+        return self.numerator.is_zero() | self.denominator.is_zero()
+
+    def __eq__(self: fe25519_fraction, other: Union[fe25519_fraction, fe25519]) -> bool:
+        """
+        Determine whether this fraction and another have the same value
+        (by cross-multiplication and thus without any inversion).
+
+        >>> (one, two) = (fe25519.one(), fe25519.one() + fe25519.one())
+        >>> fe25519_fraction(one, two) == fe25519_fraction(two, two + two)
+        True
+        >>> fe25519_fraction(one, two) == one
+        False
+        """
+        ((a, b), (c, d)) = (self._canonical(), fe25519_fraction._fraction(other)._canonical())
+        return a * d == c * b
+
+    __hash__ = None # Equal fractions may have different numerators and denominators.
+
+    def to_bytes(self: fe25519_fraction) -> bytes:
+        """
+        Build the byte representation of the value of this fraction.
+
+        >>> fe25519_fraction(fe25519.one()).to_bytes().hex()
+        '0100000000000000000000000000000000000000000000000000000000000000'
+        """
+        return self.normalize().to_bytes()
+
+    def __bytes__(self: fe25519_fraction) -> bytes:
+        """
+        Build the byte representation of the value of this fraction.
+
+        >>> bytes(fe25519_fraction(fe25519.one())).hex()
+        '0100000000000000000000000000000000000000000000000000000000000000'
+        """
+        return self.to_bytes()
+
+    def __str__(self: fe25519_fraction) -> str:
+        """
+        Obtain the string representation of a fraction.
+
+        >>> str(fe25519_fraction(fe25519.one()))
+        'fe25519_fraction(fe25519([1, 0, 0, 0, 0]), fe25519([1, 0, 0, 0, 0]))'
+        """
+        return 'fe25519_fraction(' + str(self.numerator) + ', ' + str(self.denominator) + ')'
+
+    def __repr__(self: fe25519_fraction) -> str:
+        """
+        Obtain the string representation of a fraction.
+        """
+        return str(self) # pragma: no cover
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
@@ -0,0 +1,661 @@
+"""
+Generator for specialized, straight-line Python implementations of the
+composite field operations (such as inversion) supported by the
+:obj:`~fe25519.fe25519.fe25519` class.
+
+Each generated kernel operates directly on the five limbs of its inputs,
+keeps all intermediate limbs in local variables, and fully unrolls the
+addition chain of the routine it implements. Carry chains for intermediate
+values that are known to be sufficiently small are emitted without the
+(redundant) modular truncations found in the general-purpose methods, while
+operations that may receive arbitrary limbs replicate those methods exactly.
+Thus, the output of every kernel is identical (limb for limb) to that of the
+corresponding chain of method invocations.
+
+The generated source is written to a cache directory (in a file named
+using the SHA-256 digest of the source, which is checked before the file is
+loaded) and is loaded as a module (so that its compiled bytecode is also
+cached). The cache directory
+can be specified using the ``FE25519_KERNEL_CACHE`` environment variable; if
+that variable is set to an empty string (or the cache directory cannot be
+written), the kernels are compiled in memory instead.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+from types import ModuleType
+import os
+import os.path
+import glob
+import hashlib
+import tempfile
+import threading
+import importlib.util
+import doctest
+
+_SQRTM1 = [
+    1718705420411056, 234908883556509, 2233514472574048, 2117202627021982, 765476049583133
+]
+
+class emitter:
+    """
+    Builder of the body of a single kernel. Each variable corresponds to
+    five local limb variables and is associated with an upper bound on the
+    bit length of its limbs (used to determine which truncations can be
+    omitted without changing the result).
+    """
+    def __init__(self: emitter, parameters: Sequence[str], bits: int = 64):
+        self.lines = []
+        self.indent = 0
+        self.bits = {name: bits for name in parameters}
+
+    def limbs(self: emitter, name: str) -> List[str]:
+        """Return the names of the local variables of a variable."""
+        return [name + '_' + str(i) for i in range(5)]
+
+    def emit(self: emitter, *lines: str):
+        """Append lines to the body of the kernel."""
+        self.lines.extend('    ' * self.indent + line for line in lines)
+
+    def const(self: emitter, dst: str, ns: Sequence[int]):
+        """Assign a constant to a variable."""
+        self.emit(*[d + ' = ' + str(n) for (d, n) in zip(self.limbs(dst), ns)])
+        self.bits[dst] = max(n.bit_length() for n in ns)
+
+    def mul(
+            self: emitter, dst: str, a: str, b: str,
+            addend: Optional[str] = None, subtract: bool = False
+        ):
+        """
+        Emit a multiplication (as in :obj:`~fe25519.fe25519.fe25519.__mul__`),
+        optionally fused with the addition (or subtraction) of another
+        variable before the carry chain (see :obj:`accumulate`).
+        """
+        ((f0, f1, f2, f3, f4), (g0, g1, g2, g3, g4)) = (self.limbs(a), self.limbs(b))
+        if addend is not None or self.bits[a] + self.bits[b] <= 108:
+            self.emit(
+                'f1_19 = 19 * ' + f1,
+                'f2_19 = 19 * ' + f2,
+                'f3_19 = 19 * ' + f3,
+                'f4_19 = 19 * ' + f4,
+                'r0 = ' + f0 + '*' + g0 + ' + f1_19*' + g4 + ' + f2_19*' + g3 +
+                    ' + f3_19*' + g2 + ' + f4_19*' + g1,
+                'r1 = ' + f0 + '*' + g1 + ' + ' + f1 + '*' + g0 + ' + f2_19*' + g4 +
+                    ' + f3_19*' + g3 + ' + f4_19*' + g2,
+                'r2 = ' + f0 + '*' + g2 + ' + ' + f1 + '*' + g1 + ' + ' + f2 + '*' + g0 +
+                    ' + f3_19*' + g4 + ' + f4_19*' + g3,
+                'r3 = ' + f0 + '*' + g3 + ' + ' + f1 + '*' + g2 + ' + ' + f2 + '*' + g1 +
+                    ' + ' + f3 + '*' + g0 + ' + f4_19*' + g4,
+                'r4 = ' + f0 + '*' + g4 + ' + ' + f1 + '*' + g3 + ' + ' + f2 + '*' + g2 +
+                    ' + ' + f3 + '*' + g1 + ' + ' + f4 + '*' + g0
+            )
+            self.accumulate(addend, subtract)
+            self._carry_narrow(dst)
+        else:
+            self.emit(
+                'f1_19 = (19 * ' + f1 + ') % 18446744073709551616',
+                'f2_19 = (19 * ' + f2 + ') % 18446744073709551616',
+                'f3_19 = (19 * ' + f3 + ') % 18446744073709551616',
+                'f4_19 = (19 * ' + f4 + ') % 18446744073709551616',
+                'r0 = (' + f0 + '*' + g0 + ' + f1_19*' + g4 + ' + f2_19*' + g3 +
+                    ' + f3_19*' + g2 + ' + f4_19*' + g1 + ') % 340282366920938463463374607431768211456',
+                'r1 = (' + f0 + '*' + g1 + ' + ' + f1 + '*' + g0 + ' + f2_19*' + g4 +
+                    ' + f3_19*' + g3 + ' + f4_19*' + g2 + ') % 340282366920938463463374607431768211456',
+                'r2 = (' + f0 + '*' + g2 + ' + ' + f1 + '*' + g1 + ' + ' + f2 + '*' + g0 +
+                    ' + f3_19*' + g4 + ' + f4_19*' + g3 + ') % 340282366920938463463374607431768211456',
+                'r3 = (' + f0 + '*' + g3 + ' + ' + f1 + '*' + g2 + ' + ' + f2 + '*' + g1 +
+                    ' + ' + f3 + '*' + g0 + ' + f4_19*' + g4 +
+                    ') % 340282366920938463463374607431768211456',
+                'r4 = (' + f0 + '*' + g4 + ' + ' + f1 + '*' + g3 + ' + ' + f2 + '*' + g2 +
+                    ' + ' + f3 + '*' + g1 + ' + ' + f4 + '*' + g0 +
+                    ') % 340282366920938463463374607431768211456'
+            )
+            self._carry_wide(dst)
+
+    def mul_small(self: emitter, dst: str, src: str, k: int):
+        """
+        Emit a multiplication by a small constant (below ``2**40``). The
+        result is identical to that of a multiplication by an element that
+        has the constant as its least significant limb (and zeros elsewhere).
+        """
+        self.emit(*[
+            'r' + str(i) + ' = ' + f + ' * ' + str(k)
+            for (i, f) in enumerate(self.limbs(src))
+        ])
+        self._carry_narrow(dst)
+
+    def sq(
+            self: emitter, dst: str, src: str, n: int = 1,
+            addend: Optional[str] = None, subtract: bool = False
+        ):
+        """
+        Emit ``n`` consecutive squarings (as in
+        :obj:`~fe25519.fe25519.fe25519.sq`), optionally fusing the last
+        one with the addition (or subtraction) of another variable before
+        the carry chain (see :obj:`accumulate`).
+        """
+        for i in range(n):
+            (f0, f1, f2, f3, f4) = self.limbs(src)
+            fused = addend if i == n - 1 else None
+            if fused is not None or self.bits[src] <= 54:
+                self.emit(
+                    'f0_2 = ' + f0 + ' << 1',
+                    'f1_2 = ' + f1 + ' << 1',
+                    'f1_38 = 38 * ' + f1,
+                    'f2_38 = 38 * ' + f2,
+                    'f3_38 = 38 * ' + f3,
+                    'f3_19 = 19 * ' + f3,
+                    'f4_19 = 19 * ' + f4,
+                    'r0 = ' + f0 + '*' + f0 + ' + f1_38*' + f4 + ' + f2_38*' + f3,
+                    'r1 = f0_2*' + f1 + ' + f2_38*' + f4 + ' + f3_19*' + f3,
+                    'r2 = f0_2*' + f2 + ' + ' + f1 + '*' + f1 + ' + f3_38*' + f4,
+                    'r3 = f0_2*' + f3 + ' + f1_2*' + f2 + ' + f4_19*' + f4,
+                    'r4 = f0_2*' + f4 + ' + f1_2*' + f3 + ' + ' + f2 + '*' + f2
+                )
+                self.accumulate(fused, subtract)
+                self._carry_narrow(dst)
+            else:
+                self.emit(
+                    'f0_2 = (' + f0 + ' << 1) % 18446744073709551616',
+                    'f1_2 = (' + f1 + ' << 1) % 18446744073709551616',
+                    'f1_38 = (38 * ' + f1 + ') % 18446744073709551616',
+                    'f2_38 = (38 * ' + f2 + ') % 18446744073709551616',
+                    'f3_38 = (38 * ' + f3 + ') % 18446744073709551616',
+                    'f3_19 = (19 * ' + f3 + ') % 18446744073709551616',
+                    'f4_19 = (19 * ' + f4 + ') % 18446744073709551616',
+                    'r0 = (' + f0 + '*' + f0 + ' + f1_38*' + f4 + ' + f2_38*' + f3 +
+                        ') % 340282366920938463463374607431768211456',
+                    'r1 = (f0_2*' + f1 + ' + f2_38*' + f4 + ' + f3_19*' + f3 +
+                        ') % 340282366920938463463374607431768211456',
+                    'r2 = (f0_2*' + f2 + ' + ' + f1 + '*' + f1 + ' + f3_38*' + f4 +
+                        ') % 340282366920938463463374607431768211456',
+                    'r3 = (f0_2*' + f3 + ' + f1_2*' + f2 + ' + f4_19*' + f4 +
+                        ') % 340282366920938463463374607431768211456',
+                    'r4 = (f0_2*' + f4 + ' + f1_2*' + f3 + ' + ' + f2 + '*' + f2 +
+                        ') % 340282366920938463463374607431768211456'
+                )
+                self._carry_wide(dst)
+            src = dst
+
+    def accumulate(self: emitter, addend: Optional[str], subtract: bool = False):
+        """
+        Emit the addition (or subtraction) of a variable to (or from) the
+        unreduced columns of a product, so that a single carry chain yields
+        the result of the fused operation. A subtraction first adds a
+        multiple of the modulus that exceeds every limb of the subtrahend
+        (so that no column can become negative).
+        """
+        if addend is None:
+            return
+        if not subtract:
+            self.emit(*['r' + str(i) + ' += ' + c for (i, c) in enumerate(self.limbs(addend))])
+            return
+        shift = max(self.bits[addend], 51) - 50
+        offsets = [(2 ** 51 - 19) << shift] + [(2 ** 51 - 1) << shift] * 4
+        self.emit(*[
+            'r' + str(i) + ' += ' + str(offset) + ' - ' + c
+            for (i, (offset, c)) in enumerate(zip(offsets, self.limbs(addend)))
+        ])
+
+    def _carry_narrow(self: emitter, dst: str):
+        """
+        Emit the carry chain that follows a multiplication or squaring
+        without truncations (which is exact for non-negative columns of any
+        size and always yields limbs below ``2**52``).
+        """
+        (h0, h1, h2, h3, h4) = self.limbs(dst)
+        self.emit(
+            'r1 += r0 >> 51',
+            'r2 += r1 >> 51',
+            'r3 += r2 >> 51',
+            'r4 += r3 >> 51',
+            h0 + ' = (r0 & 2251799813685247) + 19 * (r4 >> 51)',
+            h1 + ' = (r1 & 2251799813685247) + (' + h0 + ' >> 51)',
+            h0 + ' &= 2251799813685247',
+            h2 + ' = (r2 & 2251799813685247) + (' + h1 + ' >> 51)',
+            h1 + ' &= 2251799813685247',
+            h3 + ' = r3 & 2251799813685247',
+            h4 + ' = r4 & 2251799813685247'
+        )
+        self.bits[dst] = 52
+
+    def _carry_wide(self: emitter, dst: str):
+        """
+        Emit the carry chain that follows a multiplication or squaring
+        exactly as it appears in the general-purpose methods.
+        """
+        (h0, h1, h2, h3, h4) = self.limbs(dst)
+        self.emit(
+            'r1 = (r1 + (r0 >> 51)) % 340282366920938463463374607431768211456',
+            'r2 = (r2 + (r1 >> 51)) % 340282366920938463463374607431768211456',
+            'r3 = (r3 + (r2 >> 51)) % 340282366920938463463374607431768211456',
+            'r4 = (r4 + (r3 >> 51)) % 340282366920938463463374607431768211456',
+            h0 + ' = ((r0 % 18446744073709551616) & 2251799813685247)',
+            h0 + ' = (' + h0 + ' + (19*((r4 >> 51) % 18446744073709551616)))' +
+                ' % 18446744073709551616',
+            h1 + ' = ((r1 % 18446744073709551616) & 2251799813685247) + (' + h0 + ' >> 51)',
+            h0 + ' &= 2251799813685247',
+            h2 + ' = ((r2 % 18446744073709551616) & 2251799813685247) + (' + h1 + ' >> 51)',
+            h1 + ' &= 2251799813685247',
+            h3 + ' = (r3 % 18446744073709551616) & 2251799813685247',
+            h4 + ' = (r4 % 18446744073709551616) & 2251799813685247'
+        )
+        self.bits[dst] = 52
+
+    def add(self: emitter, dst: str, a: str, b: str):
+        """Emit an addition (as in :obj:`~fe25519.fe25519.fe25519.__add__`)."""
+        pairs = list(zip(self.limbs(dst), self.limbs(a), self.limbs(b)))
+        bits = max(self.bits[a], self.bits[b]) + 1
+        if bits <= 64:
+            self.emit(*[d + ' = ' + m + ' + ' + n for (d, m, n) in pairs])
+        else:
+            self.emit(*[
+                d + ' = (' + m + ' + ' + n + ') % 18446744073709551616'
+                for (d, m, n) in pairs
+            ])
+        self.bits[dst] = min(bits, 64)
+
+    def sub(self: emitter, dst: str, a: str, b: str):
+        """
+        Emit a subtraction (as in :obj:`~fe25519.fe25519.fe25519.__sub__`).
+        The variable ``a`` may be ``None`` (representing zero).
+        """
+        (h0, h1, h2, h3, h4) = self.limbs(b)
+        if self.bits[b] <= 62:
+            self.emit(
+                'h1 = ' + h1 + ' + (' + h0 + ' >> 51)',
+                'h0 = ' + h0 + ' & 2251799813685247',
+                'h2 = ' + h2 + ' + (h1 >> 51)',
+                'h1 &= 2251799813685247',
+                'h3 = ' + h3 + ' + (h2 >> 51)',
+                'h2 &= 2251799813685247',
+                'h4 = ' + h4 + ' + (h3 >> 51)',
+                'h3 &= 2251799813685247',
+                'h0 += 19 * (h4 >> 51)',
+                'h4 &= 2251799813685247'
+            )
+        else:
+            self.emit(
+                'h1 = (' + h1 + ' + (' + h0 + ' >> 51)) % 18446744073709551616',
+                'h0 = ' + h0 + ' & 2251799813685247',
+                'h2 = (' + h2 + ' + (h1 >> 51)) % 18446744073709551616',
+                'h1 &= 2251799813685247',
+                'h3 = (' + h3 + ' + (h2 >> 51)) % 18446744073709551616',
+                'h2 &= 2251799813685247',
+                'h4 = (' + h4 + ' + (h3 >> 51)) % 18446744073709551616',
+                'h3 &= 2251799813685247',
+                'h0 = (h0 + 19 * (h4 >> 51)) % 18446744073709551616',
+                'h4 &= 2251799813685247'
+            )
+        offsets = [4503599627370458] + [4503599627370494] * 4
+        bits = 53 if a is None else max(self.bits[a], 52) + 1
+        for (i, (d, offset)) in enumerate(zip(self.limbs(dst), offsets)):
+            term = str(offset) if a is None else self.limbs(a)[i] + ' + ' + str(offset)
+            if bits <= 64:
+                self.emit(d + ' = ' + term + ' - h' + str(i))
+            else:
+                self.emit(d + ' = ((' + term + ') - h' + str(i) + ') % 18446744073709551616')
+        self.bits[dst] = min(bits, 64)
+
+    def cmov(self: emitter, dst: str, a: str, b: str, flag: str):
+        """Emit a conditional selection (as in :obj:`~fe25519.fe25519.fe25519.cmov`)."""
+        self.emit('mask = 18446744073709551616 - (' + flag + ')')
+        self.emit(*[
+            d + ' = ' + f + ' ^ ((' + f + ' ^ ' + g + ') & mask)'
+            for (d, f, g) in zip(self.limbs(dst), self.limbs(a), self.limbs(b))
+        ])
+        self.bits[dst] = max(self.bits[a], self.bits[b])
+
+    def cswap(self: emitter, a: str, b: str, flag: str):
+        """
+        Emit a conditional swap of two variables (as in
+        :obj:`~fe25519.fe25519.fe25519.cswap`).
+        """
+        self.emit('mask = 18446744073709551616 - (' + flag + ')')
+        for (f, g) in zip(self.limbs(a), self.limbs(b)):
+            self.emit('x = (' + f + ' ^ ' + g + ') & mask', f + ' ^= x', g + ' ^= x')
+        self.bits[a] = self.bits[b] = max(self.bits[a], self.bits[b])
+
+    def reduce(self: emitter, dst: str, src: str):
+        """Emit a reduction (as in :obj:`~fe25519.fe25519.fe25519.reduce`)."""
+        (t0, t1, t2, t3, t4) = self.limbs(dst)
+        self.emit(*[d + ' = ' + s for (d, s) in zip(self.limbs(dst), self.limbs(src))])
+        chain = [
+            t1 + ' += ' + t0 + ' >> 51', t0 + ' &= 2251799813685247',
+            t2 + ' += ' + t1 + ' >> 51', t1 + ' &= 2251799813685247',
+            t3 + ' += ' + t2 + ' >> 51', t2 + ' &= 2251799813685247',
+            t4 + ' += ' + t3 + ' >> 51', t3 + ' &= 2251799813685247'
+        ]
+        wrap = [t0 + ' += 19 * (' + t4 + ' >> 51)', t4 + ' &= 2251799813685247']
+        self.emit(*(chain + wrap + chain + wrap))
+        self.emit(t0 + ' += 19')
+        self.emit(*(chain + wrap))
+        self.emit(
+            t0 + ' += 2251799813685229',
+            t1 + ' += 2251799813685247',
+            t2 + ' += 2251799813685247',
+            t3 + ' += 2251799813685247',
+            t4 + ' += 2251799813685247'
+        )
+        self.emit(*(chain + [t4 + ' &= 2251799813685247']))
+        self.bits[dst] = 51
+
+    def is_zero(self: emitter, flag: str, src: str):
+        """Emit a zero test (as in :obj:`~fe25519.fe25519.fe25519.is_zero`)."""
+        self.reduce('c', src)
+        self.emit(flag + ' = 1 & (((' + ' | '.join(self.limbs('c')) + ') - 1) >> 51)')
+
+    def is_negative(self: emitter, flag: str, src: str):
+        """Emit a sign test (as in :obj:`~fe25519.fe25519.fe25519.is_negative`)."""
+        self.reduce('c', src)
+        self.emit(flag + ' = ' + self.limbs('c')[0] + ' & 1')
+
+    def result(self: emitter, *items: str) -> str:
+        """Emit the return statement of the kernel."""
+        parts = [
+            '[' + ', '.join(self.limbs(item)) + ']' if item in self.bits else item
+            for item in items
+        ]
+        self.emit('return ' + (parts[0] if len(parts) == 1 else '(' + ', '.join(parts) + ')'))
+
+def _pow22523(e: emitter, z: str, out: str):
+    """Emit the addition chain for :obj:`~fe25519.fe25519.fe25519.pow22523`."""
+    e.sq('t0', z)
+    e.sq('t1', 't0', 2)
+    e.mul('t1', z, 't1')
+    e.mul('t0', 't0', 't1')
+    e.sq('t0', 't0')
+    e.mul('t0', 't1', 't0')
+    e.sq('t1', 't0', 5)
+    e.mul('t0', 't1', 't0')
+    e.sq('t1', 't0', 10)
+    e.mul('t1', 't1', 't0')
+    e.sq('t2', 't1', 20)
+    e.mul('t1', 't2', 't1')
+    e.sq('t1', 't1', 10)
+    e.mul('t0', 't1', 't0')
+    e.sq('t1', 't0', 50)
+    e.mul('t1', 't1', 't0')
+    e.sq('t2', 't1', 100)
+    e.mul('t1', 't2', 't1')
+    e.sq('t1', 't1', 50)
+    e.mul('t0', 't1', 't0')
+    e.sq('t0', 't0', 2)
+    e.mul(out, 't0', z)
+
+def _invert(e: emitter, z: str, out: str):
+    """Emit the addition chain for :obj:`~fe25519.fe25519.fe25519.invert`."""
+    e.sq('t0', z)
+    e.sq('t1', 't0', 2)
+    e.mul('t1', z, 't1')
+    e.mul('t0', 't0', 't1')
+    e.sq('t2', 't0')
+    e.mul('t1', 't1', 't2')
+    e.sq('t2', 't1', 5)
+    e.mul('t1', 't2', 't1')
+    e.sq('t2', 't1', 10)
+    e.mul('t2', 't2', 't1')
+    e.sq('t3', 't2', 20)
+    e.mul('t2', 't3', 't2')
+    e.sq('t2', 't2', 10)
+    e.mul('t1', 't2', 't1')
+    e.sq('t2', 't1', 50)
+    e.mul('t2', 't2', 't1')
+    e.sq('t3', 't2', 100)
+    e.mul('t2', 't3', 't2')
+    e.sq('t2', 't2', 50)
+    e.mul('t1', 't2', 't1')
+    e.sq('t1', 't1', 5)
+    e.mul(out, 't1', 't0')
+
+def _chi25519(e: emitter, z: str, out: str):
+    """Emit the addition chain for :obj:`~fe25519.fe25519.fe25519.chi25519`."""
+    e.sq('t0', z)
+    e.mul('t1', 't0', z)
+    e.sq('t0', 't1')
+    e.sq('t2', 't0', 2)
+    e.mul('t2', 't2', 't0')
+    e.mul('t1', 't2', z)
+    e.sq('t2', 't1', 5)
+    e.mul('t1', 't2', 't1')
+    e.sq('t2', 't1', 10)
+    e.mul('t2', 't2', 't1')
+    e.sq('t3', 't2', 20)
+    e.mul('t2', 't3', 't2')
+    e.sq('t2', 't2', 10)
+    e.mul('t1', 't2', 't1')
+    e.sq('t2', 't1', 50)
+    e.mul('t2', 't2', 't1')
+    e.sq('t3', 't2', 100)
+    e.mul('t2', 't3', 't2')
+    e.sq('t2', 't2', 50)
+    e.mul('t1', 't2', 't1')
+    e.sq('t1', 't1', 4)
+    e.mul(out, 't1', 't0')
+
+def _sqrt_ratio_m1_ristretto255(e: emitter, u: str, v: str):
+    """
+    Emit the body of
+    :obj:`~fe25519.fe25519.fe25519.sqrt_ratio_m1_ristretto255`.
+    """
+    e.const('sqrtm1', _SQRTM1)
+    e.sq('v3', v)
+    e.mul('v3', 'v3', v)                    # v3 = v^3
+    e.sq('x', 'v3')
+    e.mul('x', 'x', v)
+    e.mul('x', 'x', u)                      # x = uv^7
+    _pow22523(e, 'x', 'x')                  # x = (uv^7)^((q-5)/8)
+    e.mul('x', 'x', 'v3')
+    e.mul('x', 'x', u)                      # x = uv^3(uv^7)^((q-5)/8)
+    e.sq('vxx', 'x')
+    e.mul('vxx', 'vxx', v)                  # vx^2
+    e.sub('m', 'vxx', u)                    # vx^2-u
+    e.add('p', 'vxx', u)                    # vx^2+u
+    e.mul('f', u, 'sqrtm1')                 # u*sqrt(-1)
+    e.add('f', 'vxx', 'f')                  # vx^2+u*sqrt(-1)
+    e.is_zero('has_m_root', 'm')
+    e.is_zero('has_p_root', 'p')
+    e.is_zero('has_f_root', 'f')
+    e.mul('xs', 'x', 'sqrtm1')              # x*sqrt(-1)
+    e.cmov('x', 'x', 'xs', 'has_p_root | has_f_root')
+    e.is_negative('neg', 'x')               # abs(x)
+    e.sub('xn', None, 'x')
+    e.cmov('x', 'x', 'xn', 'neg')
+    e.result('x', 'has_m_root | has_p_root')
+
+def _ladder_step(e: emitter, x1: str, coordinates: Sequence[str]):
+    """
+    Emit a combined differential addition and doubling step of the
+    Montgomery ladder (as specified in RFC 7748) that updates the
+    coordinates ``(x2, z2, x3, z3)`` in place.
+    """
+    (x2, z2, x3, z3) = coordinates
+    e.add('a', x2, z2)
+    e.sq('aa', 'a')
+    e.sub('b', x2, z2)
+    e.sq('bb', 'b')
+    e.sub('e', 'aa', 'bb')
+    e.add('c', x3, z3)
+    e.sub('d', x3, z3)
+    e.mul('da', 'd', 'a')
+    e.mul('cb', 'c', 'b')
+    e.add(x3, 'da', 'cb')
+    e.sq(x3, x3)                            # x3 = (DA+CB)^2
+    e.sub(z3, 'da', 'cb')
+    e.sq(z3, z3)
+    e.mul(z3, x1, z3)                       # z3 = x1*(DA-CB)^2
+    e.mul(x2, 'aa', 'bb')                   # x2 = AA*BB
+    e.mul_small('t', 'e', 121665)
+    e.add('t', 'aa', 't')
+    e.mul(z2, 'e', 't')                     # z2 = E*(AA+a24*E)
+
+def _x25519(e: emitter, u: str):
+    """
+    Emit the Montgomery ladder (as specified in RFC 7748) for a clamped
+    scalar ``k`` followed by the conversion of the result to affine form.
+    """
+    e.const('x2', [1, 0, 0, 0, 0])
+    e.const('z2', [0, 0, 0, 0, 0])
+    e.emit(*[x + ' = ' + v for (x, v) in zip(e.limbs('x3'), e.limbs(u))])
+    e.const('z3', [1, 0, 0, 0, 0])
+    e.emit('swap = 0', 'for i in range(254, -1, -1):')
+    e.indent += 1
+    for name in (u, 'x2', 'z2', 'x3', 'z3'):
+        e.bits[name] = 52 # Loop-carried variables are always carried.
+    e.emit('bit = (k >> i) & 1', 'swap ^= bit')
+    e.cswap('x2', 'x3', 'swap')
+    e.cswap('z2', 'z3', 'swap')
+    e.emit('swap = bit')
+    _ladder_step(e, u, ['x2', 'z2', 'x3', 'z3'])
+    e.indent -= 1
+    e.cswap('x2', 'x3', 'swap')
+    e.cswap('z2', 'z3', 'swap')
+    _invert(e, 'z2', 'z2')
+    e.mul('x2', 'x2', 'z2')
+    e.reduce('x2', 'x2')
+    e.result('x2')
+
+def _kernel(
+        name: str, parameters: Sequence[str], body, bits: int = 64,
+        scalars: Sequence[str] = ()
+    ) -> str:
+    """
+    Generate the source code of a single kernel function (having the
+    supplied limb bounds for its element parameters and also accepting
+    the supplied integer parameters).
+    """
+    e = emitter(parameters, bits)
+    body(e, *parameters)
+    arguments = ', '.join(list(scalars) + [l for p in parameters for l in e.limbs(p)])
+    return '\n'.join(
+        ['def ' + name + '(' + arguments + '): # pylint: disable=too-many-statements']
+        + ['    ' + line for line in e.lines]
+    ) + '\n'
+
+def source() -> str:
+    """
+    Generate the source code of the module containing all kernels.
+
+    >>> 'def invert(' in source()
+    True
+    """
+    return '\n\n'.join([
+        '"""Kernels generated by :obj:`fe25519.kernels` (do not edit)."""',
+        _kernel('pow22523', ['z'], lambda e, z: (_pow22523(e, z, 'o'), e.result('o'))),
+        _kernel('invert', ['z'], lambda e, z: (_invert(e, z, 'o'), e.result('o'))),
+        _kernel('chi25519', ['z'], lambda e, z: (_chi25519(e, z, 'o'), e.result('o'))),
+        _kernel('sqrt_ratio_m1_ristretto255', ['u', 'v'], _sqrt_ratio_m1_ristretto255),
+        _kernel(
+            'ladder_step', ['x1', 'x2', 'z2', 'x3', 'z3'],
+            lambda e, x1, *ps: (_ladder_step(e, x1, ps), e.result(*ps))
+        ),
+        _kernel('x25519', ['u'], _x25519, 51, ['k']),
+        _kernel('mul_add', ['f', 'g', 'c'], lambda e, f, g, c: (e.mul('o', f, g, c), e.result('o'))),
+        _kernel(
+            'mul_sub', ['f', 'g', 'c'],
+            lambda e, f, g, c: (e.mul('o', f, g, c, True), e.result('o'))
+        ),
+        _kernel(
+            'sq_mul', ['f', 'v'], # Untruncated (and thus exact) for all inputs.
+            lambda e, f, v: (e.sq('o', f), e.mul('o', 'o', v), e.result('o')), 54
+        ),
+        _kernel('sq_add', ['f', 'c'], lambda e, f, c: (e.sq('o', f, 1, c), e.result('o')))
+    ])
+
+def _cache_directory() -> Optional[str]:
+    """
+    Determine the directory in which generated kernels should be cached
+    (or ``None`` if they should not be cached on disk).
+    """
+    directory = os.environ.get('FE25519_KERNEL_CACHE')
+    if directory is None:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(base, 'fe25519')
+    return directory or None
+
+def _digest(code: str) -> str:
+    """Compute the SHA-256 digest of the source code of the kernels."""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+def _verified(path: str, digest: str) -> bool:
+    """
+    Determine whether a cached file exists and has exactly the expected
+    contents (so that no other code is ever loaded from the cache).
+    """
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest() == digest
+    except FileNotFoundError:
+        return False
+
+def _remove_stale(directory: str, name: str):
+    """
+    Remove any previously cached kernels (and their compiled bytecode) other
+    than those having the specified module name.
+    """
+    paths = glob.glob(os.path.join(directory, 'fe25519_kernels_*.py')) + \
+        glob.glob(os.path.join(directory, '__pycache__', 'fe25519_kernels_*.pyc'))
+    for path in paths:
+        if os.path.basename(path).split('.')[0] != name:
+            try:
+                os.remove(path)
+            except OSError: # pragma: no cover
+                pass # Another process may have removed it already.
+
+def _compile(name: str, code: str) -> ModuleType:
+    """Compile the kernels in memory."""
+    module = ModuleType(name)
+    exec(compile(code, name, 'exec'), module.__dict__) # pylint: disable=exec-used
+    return module
+
+def _load(directory: Optional[str]) -> ModuleType:
+    """
+    Load the kernels from the cache directory, generating and writing them
+    to that directory first if necessary. The cached file is named using the
+    SHA-256 digest of the generated source code, and its contents are checked
+    against that digest before it is loaded (a file that does not match is
+    replaced). Any stale kernels are removed when a new file is written.
+    """
+    code = source()
+    digest = _digest(code)
+    name = 'fe25519_kernels_' + digest
+    if directory is None:
+        return _compile(name, code)
+
+    path = os.path.join(directory, name + '.py')
+    try:
+        if not _verified(path, digest):
+            os.makedirs(directory, exist_ok=True)
+            (descriptor, temporary) = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(descriptor, 'w', encoding='utf-8', newline='') as file:
+                file.write(code)
+            os.replace(temporary, path) # Atomic, even if other processes race.
+            _remove_stale(directory, name)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    except (OSError, SyntaxError):
+        return _compile(name, code)
+
+_kernels: Dict[str, ModuleType] = {}
+_lock = threading.Lock()
+
+def kernels() -> ModuleType:
+    """
+    Return the module containing the generated kernels, generating and/or
+    loading it if this is the first invocation.
+
+    >>> ns = kernels().invert(1, 0, 0, 0, 0)
+    >>> ns
+    [1, 0, 0, 0, 0]
+    """
+    module = _kernels.get('module')
+    if module is None:
+        with _lock:
+            if 'module' not in _kernels:
+                _kernels['module'] = _load(_cache_directory())
+            module = _kernels['module']
+    return module
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
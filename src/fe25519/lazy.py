@@ -0,0 +1,303 @@
+"""
+Lazy evaluation of formulas over elements of the
+:obj:`~fe25519.fe25519.fe25519` class.
+
+Operations on instances of :obj:`expression` build a directed acyclic graph
+instead of computing results. When the graph is evaluated, it is optimized
+as follows before any arithmetic is performed:
+
+* common subexpressions (including those that differ only in the order of
+  the operands of commutative operations) are computed once;
+* a product of an expression with itself becomes a squaring;
+* chains of squarings become single ``sq_n`` operations;
+* all inversions that become computable at the same point of the evaluation
+  are performed together using
+  :obj:`~fe25519.fe25519.fe25519.invert_many`.
+
+The leaves of a graph can be elements or (equal-length) sequences of
+elements. In the latter case, the graph is evaluated elementwise using the
+batch operations of the class (such as
+:obj:`~fe25519.fe25519.fe25519.mul_many`), so the selected backend (*e.g.*,
+``'numpy'``) determines how the arithmetic is vectorized. Elements can also
+appear as the right-hand operands of operations on expressions.
+
+>>> (x, y) = (lazy(fe25519.one() + fe25519.one()), fe25519.one())
+>>> r = (x * x + y) * ~(x * x + y)
+>>> r.evaluate() == fe25519.one()
+True
+>>> count(r)
+{'sq': 1, 'add': 1, 'invert': 1, 'mul': 1}
+
+As with :obj:`~fe25519.fe25519.fe25519.invert_many`, results are identical
+to those of eager evaluation for all elements that satisfy the bounds on
+limbs that this library maintains.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Tuple, Union
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+
+_COMMUTATIVE = ('add', 'mul')
+
+class expression:
+    """
+    Node of a lazily evaluated formula. Instances should be created using
+    :obj:`lazy` and the operators of this class.
+    """
+    def __init__(
+            self: expression, operation: str, operands: Tuple[expression, ...] = (),
+            value: Any = None
+        ):
+        """Create a node (a leaf if the operation is ``'leaf'``)."""
+        self.operation = operation
+        self.operands = operands
+        self.value = value
+
+    @staticmethod
+    def _wrap(other: Union[expression, fe25519, Sequence[fe25519]]) -> expression:
+        """Convert an operand into an expression (if it is not one already)."""
+        return other if isinstance(other, expression) else lazy(other)
+
+    def __add__(self: expression, other: Union[expression, fe25519]) -> expression:
+        """
+        Build the sum of this expression and another.
+
+        >>> (lazy(fe25519.one()) + fe25519.one()).evaluate() == fe25519.one() + fe25519.one()
+        True
+        """
+        return expression('add', (self, expression._wrap(other)))
+
+    def __sub__(self: expression, other: Union[expression, fe25519]) -> expression:
+        """
+        Build the difference of this expression and another.
+
+        >>> (lazy(fe25519.one()) - fe25519.one()).evaluate() == fe25519.zero()
+        True
+        """
+        return expression('sub', (self, expression._wrap(other)))
+
+    def __neg__(self: expression) -> expression:
+        """
+        Build the negation of this expression.
+
+        >>> (-lazy(fe25519.one())).evaluate() == -fe25519.one()
+        True
+        """
+        return expression('neg', (self,))
+
+    def __mul__(self: expression, other: Union[expression, fe25519]) -> expression:
+        """
+        Build the product of this expression and another.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> (lazy(two) * two).evaluate() == two.sq()
+        True
+        """
+        return expression('mul', (self, expression._wrap(other)))
+
+    def sq(self: expression) -> expression: # pylint: disable=invalid-name
+        """
+        Build the square of this expression.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> lazy(two).sq().sq().evaluate() == two.sq().sq()
+        True
+        """
+        return expression('sq', (self,), 1)
+
+    def invert(self: expression) -> expression:
+        """
+        Build the multiplicative inverse of this expression.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> lazy(two).invert().evaluate() == two.invert()
+        True
+        """
+        return expression('invert', (self,))
+
+    def __invert__(self: expression) -> expression:
+        """
+        Build the multiplicative inverse of this expression.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> (~lazy(two)).evaluate() == ~two
+        True
+        """
+        return self.invert()
+
+    def evaluate(self: expression) -> Union[fe25519, List[fe25519]]:
+        """
+        Optimize and evaluate the graph of this expression.
+
+        >>> lazy([fe25519.one()] * 2).sq().evaluate() == [fe25519.one()] * 2
+        True
+        """
+        return evaluate(self)[0]
+
+def lazy(x: Union[fe25519, Sequence[fe25519]]) -> expression:
+    """
+    Create a leaf expression from an element (or from a sequence of elements
+    that should be processed elementwise).
+
+    >>> lazy(fe25519.one()).evaluate() == fe25519.one()
+    True
+    """
+    return expression('leaf', (), x if isinstance(x, fe25519) else list(x))
+
+def _postorder(roots: Sequence[expression]) -> List[expression]:
+    """Traverse a graph in post-order (without recursion)."""
+    (order, visited, stack) = ([], set(), [(root, False) for root in reversed(roots)])
+    while stack:
+        (node, expanded) = stack.pop()
+        if expanded:
+            order.append(node)
+        elif id(node) not in visited:
+            visited.add(id(node))
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(node.operands))
+    return order
+
+def _optimize(roots: Sequence[expression]) -> Tuple[List[tuple], List[int], List[Any]]:
+    """
+    Build an optimized program for a graph. The program is a list of
+    instructions ``(operation, operands, parameter)`` in which operands are
+    indices of earlier instructions.
+    """
+    (program, keys, indices, leaves) = ([], {}, {}, [])
+    for node in _postorder(roots):
+        if node.operation == 'leaf':
+            key = ('leaf', id(node.value))
+            if key not in keys:
+                leaves.append(node.value)
+        else:
+            operation = node.operation
+            operands = tuple(indices[id(operand)] for operand in node.operands)
+            parameter = node.value
+            if operation == 'mul' and operands[0] == operands[1]:
+                (operation, operands, parameter) = ('sq', operands[:1], 1)
+            if operation in _COMMUTATIVE:
+                operands = tuple(sorted(operands))
+            key = (operation, operands, parameter)
+        if key not in keys:
+            keys[key] = len(program)
+            program.append(key if key[0] != 'leaf' else ('leaf', (), len(leaves) - 1))
+        indices[id(node)] = keys[key]
+
+    # Merge each squaring of a squaring that is used nowhere else.
+    outputs = [indices[id(root)] for root in roots]
+    uses = [0] * len(program)
+    for (_, operands, _) in program:
+        for operand in operands:
+            uses[operand] += 1
+    for i in outputs:
+        uses[i] += 1
+    for (i, (operation, operands, n)) in enumerate(program):
+        if operation == 'sq':
+            (source, source_n) = (operands[0], 0)
+            (inner, inner_operands, inner_n) = program[source]
+            if inner == 'sq' and uses[source] == 1:
+                (source, source_n) = (inner_operands[0], inner_n)
+                program[operands[0]] = ('dead', (), None)
+            program[i] = ('sq', (source,), n + source_n)
+    return (program, outputs, leaves)
+
+def count(*expressions: expression) -> Dict[str, int]:
+    """
+    Count the operations (by kind) that would be performed in order to
+    evaluate the supplied expressions (after optimization). A ``sq_n``
+    operation is counted as one squaring for each of its iterations.
+
+    >>> x = lazy(fe25519.one() + fe25519.one())
+    >>> count(x.sq().sq().sq() + x * x, x * x)
+    {'sq': 3, 'add': 1}
+    """
+    counts = {}
+    for (operation, _, parameter) in _optimize(expressions)[0]:
+        if operation not in ('leaf', 'dead'):
+            counts[operation] = counts.get(operation, 0) + (parameter or 1)
+    return counts
+
+def _scalar(operation: str, operands: List[fe25519], n: Any) -> fe25519:
+    """Perform an operation on elements."""
+    if operation == 'sq':
+        result = operands[0]
+        for _ in range(n):
+            result = result.sq()
+        return result
+    if operation == 'neg':
+        return -operands[0]
+    return {
+        'add': fe25519.__add__, 'sub': fe25519.__sub__, 'mul': fe25519.__mul__
+    }[operation](*operands)
+
+def _vector(operation: str, operands: List[List[fe25519]], n: Any) -> List[fe25519]:
+    """Perform an operation elementwise on lists of elements."""
+    if operation == 'sq':
+        result = operands[0]
+        for _ in range(n):
+            result = fe25519.sq_many(result)
+        return result
+    if operation == 'neg':
+        return fe25519.sub_many([fe25519.zero()] * len(operands[0]), operands[0])
+    return {
+        'add': fe25519.add_many, 'sub': fe25519.sub_many, 'mul': fe25519.mul_many
+    }[operation](*operands)
+
+def evaluate(*expressions: expression) -> List[Union[fe25519, List[fe25519]]]:
+    """
+    Optimize and evaluate the graphs of the supplied expressions (sharing
+    all common subexpressions and inversions between them).
+
+    >>> (x, y) = (lazy(fe25519.one() + fe25519.one()), lazy(fe25519.one()))
+    >>> evaluate(~x, ~(x + y), ~x * ~(x + y)) == [
+    ...     ~(fe25519.one() + fe25519.one()),
+    ...     ~(fe25519.one() + fe25519.one() + fe25519.one()),
+    ...     ~(fe25519.one() + fe25519.one()) * ~(fe25519.one() + fe25519.one() + fe25519.one())
+    ... ]
+    True
+    """
+    (program, outputs, leaves) = _optimize(expressions)
+    lengths = [len(leaf) for leaf in leaves if isinstance(leaf, list)]
+    if len(set(lengths)) > 1:
+        raise ValueError('sequences of elements must have equal lengths')
+    batch = len(lengths) > 0
+    leaves = [
+        [leaf] * lengths[0] if batch and isinstance(leaf, fe25519) else leaf
+        for leaf in leaves
+    ]
+    apply = _vector if batch else _scalar
+
+    values = [None] * len(program)
+    remaining = [i for (i, (operation, _, _)) in enumerate(program) if operation != 'dead']
+    while remaining:
+        # Compute everything that does not depend on a pending inversion,
+        # and then perform all inversions that are ready using one batch.
+        (inversions, pending) = ([], [])
+        for i in remaining:
+            (operation, operands, parameter) = program[i]
+            if any(values[j] is None for j in operands):
+                pending.append(i)
+            elif operation == 'leaf':
+                values[i] = leaves[parameter]
+            elif operation == 'invert':
+                inversions.append(i)
+            else:
+                values[i] = apply(operation, [values[j] for j in operands], parameter)
+        inputs = [values[program[i][1][0]] for i in inversions]
+        if batch:
+            results = fe25519.invert_many([x for xs in inputs for x in xs])
+            for (k, i) in enumerate(inversions):
+                values[i] = results[k * lengths[0]:(k + 1) * lengths[0]]
+        else:
+            for (i, result) in zip(inversions, fe25519.invert_many(inputs)):
+                values[i] = result
+        remaining = [i for i in pending if values[i] is None]
+
+    return [values[i] for i in outputs]
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
@@ -0,0 +1,157 @@
+"""
+Parallel batch operations over elements of the
+:obj:`~fe25519.fe25519.fe25519` class.
+
+Instances of the class are never modified by any of its methods (including
+the shared constants such as :obj:`~fe25519.fe25519.fe25519.d`), so they can
+be shared freely between threads. On free-threaded builds of CPython (3.13
+and later, when the GIL is disabled), the functions in this module use a
+pool of threads and thus achieve true parallelism without pickling. On all
+other interpreters, they use a pool of processes by default (in which case
+the supplied operation must be picklable, *e.g.*, a method of the class or a
+function defined at the top level of a module). An operation can also be
+specified using the name of a method of the class, in which case it is
+resolved within each worker (so that the backend selected using
+:obj:`~fe25519.backends.set_backend` is respected).
+"""
+from __future__ import annotations
+from typing import Any, Callable, List, Optional, Sequence, Union
+import sys
+import os
+import concurrent.futures
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519
+    from fe25519.backends import get_backend, set_backend
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+    from backends import get_backend, set_backend
+
+def gil_enabled() -> bool:
+    """
+    Determine whether the GIL is enabled in the running interpreter.
+
+    >>> isinstance(gil_enabled(), bool)
+    True
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else bool(is_gil_enabled())
+
+def executor(workers: Optional[int] = None) -> concurrent.futures.Executor:
+    """
+    Create the most suitable executor for the running interpreter: a thread
+    pool if the GIL is disabled and a process pool otherwise.
+
+    >>> with executor(1) as e:
+    ...     isinstance(e, concurrent.futures.Executor)
+    True
+    """
+    if gil_enabled():
+        return concurrent.futures.ProcessPoolExecutor(workers)
+    return concurrent.futures.ThreadPoolExecutor(workers)
+
+def chunks(xss: Sequence[Sequence[Any]], chunk_size: int) -> List[List[Sequence[Any]]]:
+    """
+    Split each of a collection of equal-length sequences into chunks.
+
+    >>> chunks([[1, 2, 3], [4, 5, 6]], 2)
+    [[[1, 2], [4, 5]], [[3], [6]]]
+    >>> chunks([[1, 2, 3]], 0)
+    Traceback (most recent call last):
+      ...
+    ValueError: chunk size must be a positive integer
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk size must be a positive integer')
+    length = min(len(xs) for xs in xss)
+    return [
+        [xs[i:i + chunk_size] for xs in xss]
+        for i in range(0, length, chunk_size)
+    ]
+
+def _resolve(backend: str, operation: Union[str, Callable[..., Any]]) -> Callable[..., Any]:
+    """
+    Select the backend (which worker processes do not inherit) and resolve
+    an operation that may be specified using the name of a method.
+    """
+    if get_backend() != backend:
+        set_backend(backend) # pragma: no cover
+    return getattr(fe25519, operation) if isinstance(operation, str) else operation
+
+def apply_map(
+        backend: str, operation: Union[str, Callable[..., Any]], xss: List[Sequence[Any]]
+    ) -> List[Any]:
+    """
+    Apply an operation to each tuple of elements within a chunk (using the
+    specified backend).
+    """
+    return list(map(_resolve(backend, operation), *xss))
+
+def apply_batch(
+        backend: str, operation: Union[str, Callable[..., Any]], xss: List[Sequence[Any]]
+    ) -> List[Any]:
+    """Apply a batch operation to a chunk (using the specified backend)."""
+    return list(_resolve(backend, operation)(*xss))
+
+def _run(
+        task: Callable[..., List[Any]],
+        operation: Union[str, Callable[..., Any]],
+        xss: Sequence[Sequence[Any]],
+        *,
+        workers: Optional[int],
+        chunk_size: int,
+        pool: Optional[concurrent.futures.Executor]
+    ) -> List[Any]:
+    """Apply a task to all chunks using an executor and concatenate the results."""
+    chunks_ = chunks(xss, chunk_size)
+    backend = get_backend()
+    owned = pool is None
+    pool = executor(workers or os.cpu_count()) if owned else pool
+    try:
+        futures = [pool.submit(task, backend, operation, chunk) for chunk in chunks_]
+        return [r for future in futures for r in future.result()]
+    finally:
+        if owned:
+            pool.shutdown()
+
+def pmap(
+        operation: Union[str, Callable[..., Any]],
+        *xss: Sequence[Any],
+        workers: Optional[int] = None,
+        chunk_size: int = 1024,
+        pool: Optional[concurrent.futures.Executor] = None
+    ) -> List[Any]:
+    """
+    Apply an operation to every element (or to every tuple of corresponding
+    elements, if more than one sequence is supplied) in parallel. The inputs
+    are split into chunks of the specified size and the chunks are processed
+    using the supplied executor (or, if none is supplied, using one that is
+    created by :obj:`executor` for this invocation).
+
+    >>> two = fe25519.one() + fe25519.one()
+    >>> pmap(fe25519.__mul__, [two] * 3, [two] * 3, chunk_size=2) == [two * two] * 3
+    True
+    """
+    return _run(apply_map, operation, xss, workers=workers, chunk_size=chunk_size, pool=pool)
+
+def pbatch(
+        operation: Union[str, Callable[..., Sequence[Any]]],
+        *xss: Sequence[Any],
+        workers: Optional[int] = None,
+        chunk_size: int = 1024,
+        pool: Optional[concurrent.futures.Executor] = None
+    ) -> List[Any]:
+    """
+    Apply a batch operation (such as :obj:`~fe25519.fe25519.fe25519.invert_many`)
+    to chunks of the supplied sequences in parallel and concatenate the results.
+
+    >>> two = fe25519.one() + fe25519.one()
+    >>> rs = pbatch('invert_many', [two] * 3, chunk_size=2)
+    >>> [r * two for r in rs] == [fe25519.one()] * 3
+    True
+    """
+    return _run(apply_batch, operation, xss, workers=workers, chunk_size=chunk_size, pool=pool)
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
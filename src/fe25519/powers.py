@@ -0,0 +1,218 @@
+"""
+Precomputed tables of powers of a fixed base element that make it possible
+to compute any power of that element using only multiplications.
+
+A table with window width ``w`` holds the powers ``g^(j * 2^(w * i))`` for
+every window index ``i`` and every nonzero window digit ``j``. A power
+``g^e`` is then the product of one entry per nonzero base-``2^w`` digit of
+``e``. Tables can be packed into a contiguous byte vector (and thus saved to
+a file). A saved table can be loaded using :obj:`power_table.load`, which
+memory-maps the file and decodes each entry only when it is first used.
+
+>>> g = fe25519.one() + fe25519.one()
+>>> table = g.fixed_base()
+>>> table.pow(10) == g.sq().sq() * g.sq().sq() * g.sq()
+True
+
+The lookups performed by :obj:`power_table.pow` depend on the exponent, so
+this module should not be used with secret exponents.
+"""
+from __future__ import annotations
+from typing import Any, List, Optional
+import mmap
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+
+_MAGIC = b'fe25519p'
+_VERSION = 1
+_HEADER = len(_MAGIC) + 4
+
+class power_table:
+    """
+    Table of powers of a fixed base element (see :obj:`fe25519.powers`).
+    Instances are usually created using
+    :obj:`~fe25519.fe25519.fe25519.fixed_base` or :obj:`load`.
+    """
+    def __init__(
+            self: power_table, base: Optional[fe25519], window: int = 4, bits: int = 255,
+            buffer: Any = None
+        ):
+        """
+        Precompute a table for the supplied base element that supports all
+        exponents below ``2**bits``. Alternatively, the base can be omitted
+        if a buffer holding the packed entries is supplied (as in
+        :obj:`from_bytes`).
+        """
+        if not 1 <= window <= 8:
+            raise ValueError('window width must be an integer between 1 and 8')
+        if bits < 1:
+            raise ValueError('number of exponent bits must be a positive integer')
+        self.window = window
+        self.windows = -(-bits // window)
+        self._buffer = buffer
+        self._mmap: Optional[mmap.mmap] = None
+        self._entries: List[Optional[fe25519]] = [None] * (self.windows * self.width())
+        if base is not None:
+            for i in range(self.windows):
+                power = base
+                for j in range(self.width()):
+                    self._entries[i * self.width() + j] = power
+                    power = power * base
+                base = power # This is the base raised to ``2**window``.
+
+    def width(self: power_table) -> int:
+        """
+        Return the number of entries in each window of this table.
+
+        >>> (fe25519.one() + fe25519.one()).fixed_base(window=2).width()
+        3
+        """
+        return (1 << self.window) - 1
+
+    def _entry(self: power_table, index: int) -> fe25519:
+        """Return an entry (decoding it from the packed buffer if necessary)."""
+        entry = self._entries[index]
+        if entry is None:
+            offset = _HEADER + 32 * index
+            entry = fe25519.from_bytes(bytes(self._buffer[offset:offset + 32]))
+            self._entries[index] = entry
+        return entry
+
+    def base(self: power_table) -> fe25519:
+        """
+        Return the base element of this table.
+
+        >>> g = fe25519.one() + fe25519.one()
+        >>> g.fixed_base().base() == g
+        True
+        """
+        return self._entry(0)
+
+    def pow(self: power_table, e: int) -> fe25519:
+        """
+        Compute the base element of this table raised to the supplied
+        non-negative exponent (using one multiplication per nonzero digit).
+
+        >>> g = fe25519.one() + fe25519.one()
+        >>> g.fixed_base().pow(0) == fe25519.one()
+        True
+        >>> g.fixed_base(bits=8).pow(256)
+        Traceback (most recent call last):
+          ...
+        ValueError: exponent must be a non-negative integer below 2**8
+        """
+        if not 0 <= e < (1 << (self.window * self.windows)):
+            raise ValueError(
+                'exponent must be a non-negative integer below 2**' +
+                str(self.window * self.windows)
+            )
+        (result, mask) = (None, self.width())
+        for i in range(self.windows):
+            digit = (e >> (self.window * i)) & mask
+            if digit != 0:
+                entry = self._entry(i * mask + digit - 1)
+                result = entry if result is None else result * entry
+        return fe25519.one() if result is None else result
+
+    def to_bytes(self: power_table) -> bytes:
+        """
+        Pack this table into a byte vector consisting of a short header
+        followed by the canonical encodings of all entries.
+
+        >>> len((fe25519.one() + fe25519.one()).fixed_base(window=2, bits=4).to_bytes())
+        204
+        """
+        header = _MAGIC + bytes([_VERSION, self.window]) + self.windows.to_bytes(2, 'little')
+        entries = [self._entry(i) for i in range(len(self._entries))]
+        return header + fe25519.to_bytes_many(entries)
+
+    @staticmethod
+    def from_bytes(bs: Any) -> power_table:
+        """
+        Create a table from a packed byte vector (or from any object that
+        supports the buffer protocol, such as a memory-mapped file). Entries
+        are decoded only when they are first used.
+
+        >>> g = fe25519.one() + fe25519.one()
+        >>> power_table.from_bytes(g.fixed_base().to_bytes()).pow(3) == g * g * g
+        True
+        >>> power_table.from_bytes(bytes(12))
+        Traceback (most recent call last):
+          ...
+        ValueError: byte vector is not a packed table of powers
+        """
+        view = memoryview(bs)
+        valid = bytes(view[:len(_MAGIC) + 1]) == _MAGIC + bytes([_VERSION]) and len(view) >= _HEADER
+        if valid:
+            window = view[len(_MAGIC) + 1]
+            windows = int.from_bytes(view[len(_MAGIC) + 2:_HEADER], 'little')
+            valid = (
+                1 <= window <= 8 and windows >= 1 and
+                len(view) == _HEADER + 32 * windows * ((1 << window) - 1)
+            )
+        if not valid:
+            view.release() # Do not prevent the underlying buffer from being closed.
+            raise ValueError('byte vector is not a packed table of powers')
+        return power_table(None, window, window * windows, view)
+
+    def save(self: power_table, path: str):
+        """Write the packed representation of this table to a file."""
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @staticmethod
+    def load(path: str) -> power_table:
+        """
+        Load a table from a file written using :obj:`save`. The file is
+        memory-mapped (so that startup cost does not depend on the size of
+        the table) and each entry is decoded when it is first used. The
+        mapping is released by :obj:`close` (or when the table is used as
+        a context manager).
+        """
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            table = power_table.from_bytes(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+        table._mmap = buffer # pylint: disable=protected-access
+        return table
+
+    def close(self: power_table):
+        """
+        Release the packed buffer of this table (and close the memory-mapped
+        file if the table was created using :obj:`load`). Only entries that
+        have already been decoded remain available.
+
+        >>> two = fe25519.one() + fe25519.one()
+        >>> table = two.fixed_base()
+        >>> table.close()
+        >>> table.pow(3) == two * two * two
+        True
+        """
+        if isinstance(self._buffer, memoryview):
+            self._buffer.release()
+        self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self: power_table) -> power_table:
+        """
+        Allow a table to be used as a context manager that closes it on exit.
+        """
+        return self
+
+    def __exit__(self: power_table, *exc_info: Any):
+        """
+        Close this table (see :obj:`close`).
+        """
+        self.close()
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
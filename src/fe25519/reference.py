@@ -0,0 +1,320 @@
+"""
+Reference implementations (using built-in Python integers and arithmetic
+modulo ``p = 2**255 - 19``) of the operations of the
+:obj:`~fe25519.fe25519.fe25519` class.
+
+Each function accepts (non-negative) integers in place of elements. These
+need not be reduced, so :obj:`value` can be used to obtain the integer that
+corresponds to the limbs of any element. Results are canonical integers
+(*i.e.*, below ``p``). These functions are deliberately written to follow
+the specifications of the operations as directly as possible (without any
+concern for efficiency), so that they can serve as an oracle for
+differential testing (see :obj:`fe25519.differential`).
+
+>>> mul(value([1, 0, 0, 0, 0]), P - 2) == P - 2
+True
+"""
+from __future__ import annotations
+from typing import Sequence, Tuple
+import doctest
+
+P = 2 ** 255 - 19
+"""Modulus of the field."""
+
+A = 486662
+"""Coefficient ``A`` of Curve25519."""
+
+SQRTM1 = pow(2, (P - 1) // 4, P)
+"""Square root of ``-1`` (the one that is used by the class)."""
+
+def value(ns: Sequence[int]) -> int:
+    """
+    Compute the integer represented by a sequence of five (possibly
+    unreduced) limbs.
+
+    >>> value([1, 1, 0, 0, 0]) == 1 + 2 ** 51
+    True
+    """
+    return sum(n << (51 * i) for (i, n) in enumerate(ns))
+
+def reduce(a: int) -> int:
+    """
+    Compute the canonical representative of an integer.
+
+    >>> reduce(P + 1)
+    1
+    """
+    return a % P
+
+def add(a: int, b: int) -> int:
+    """
+    Compute a sum.
+
+    >>> add(P - 1, 2)
+    1
+    """
+    return (a + b) % P
+
+def sub(a: int, b: int) -> int:
+    """
+    Compute a difference.
+
+    >>> sub(1, 2) == P - 1
+    True
+    """
+    return (a - b) % P
+
+def neg(a: int) -> int:
+    """
+    Compute a negation.
+
+    >>> neg(1) == P - 1
+    True
+    """
+    return (-a) % P
+
+def mul(a: int, b: int) -> int:
+    """
+    Compute a product.
+
+    >>> mul(2, 3)
+    6
+    """
+    return (a * b) % P
+
+def sq(a: int) -> int: # pylint: disable=invalid-name
+    """
+    Compute a square.
+
+    >>> sq(3)
+    9
+    """
+    return (a * a) % P
+
+def sq2(a: int) -> int:
+    """
+    Compute twice a square.
+
+    >>> sq2(3)
+    18
+    """
+    return (2 * a * a) % P
+
+def mul_add(a: int, b: int, c: int) -> int:
+    """
+    Compute a product plus a third integer.
+
+    >>> mul_add(2, 3, 4)
+    10
+    """
+    return (a * b + c) % P
+
+def mul_sub(a: int, b: int, c: int) -> int:
+    """
+    Compute a product minus a third integer.
+
+    >>> mul_sub(2, 3, 4)
+    2
+    """
+    return (a * b - c) % P
+
+def sq_mul(a: int, b: int) -> int:
+    """
+    Compute a square times a second integer.
+
+    >>> sq_mul(2, 3)
+    12
+    """
+    return (a * a * b) % P
+
+def sq_add(a: int, b: int) -> int:
+    """
+    Compute a square plus a second integer.
+
+    >>> sq_add(2, 3)
+    7
+    """
+    return (a * a + b) % P
+
+def pow22523(a: int) -> int:
+    """
+    Compute an integer raised to the power ``(p - 5) / 8``.
+
+    >>> pow22523(1)
+    1
+    """
+    return pow(a, (P - 5) // 8, P)
+
+def invert(a: int) -> int:
+    """
+    Compute a multiplicative inverse (mapping zero to zero).
+
+    >>> mul(invert(2), 2)
+    1
+    >>> invert(P)
+    0
+    """
+    return pow(a, P - 2, P)
+
+def chi25519(a: int) -> int:
+    """
+    Compute the Legendre symbol (as a canonical integer).
+
+    >>> chi25519(4)
+    1
+    >>> chi25519(2) == P - 1
+    True
+    """
+    return pow(a, (P - 1) // 2, P)
+
+def is_zero(a: int) -> int:
+    """
+    Determine whether an integer is congruent to zero.
+
+    >>> is_zero(P)
+    1
+    """
+    return int(a % P == 0)
+
+def is_negative(a: int) -> int:
+    """
+    Determine whether the canonical representative of an integer is odd.
+
+    >>> is_negative(P + 1)
+    1
+    """
+    return (a % P) & 1
+
+def eq(a: int, b: int) -> int: # pylint: disable=invalid-name
+    """
+    Determine whether two integers are congruent.
+
+    >>> eq(1, P + 1)
+    1
+    """
+    return int(a % P == b % P)
+
+def cmov(a: int, b: int, bit: int) -> int:
+    """
+    Select the first integer (if the bit is zero) or the second integer.
+
+    >>> cmov(1, 2, 1)
+    2
+    """
+    return (b if bit else a) % P
+
+def cswap(a: int, b: int, bit: int) -> Tuple[int, int]:
+    """
+    Swap two integers if the bit is set.
+
+    >>> cswap(1, 2, 1)
+    (2, 1)
+    """
+    return (b % P, a % P) if bit else (a % P, b % P)
+
+def cneg(a: int, bit: int) -> int:
+    """
+    Negate an integer if the bit is set.
+
+    >>> cneg(1, 1) == P - 1
+    True
+    """
+    return (-a if bit else a) % P
+
+def absolute(a: int) -> int:
+    """
+    Compute the absolute value (the even one of an integer and its negation).
+
+    >>> absolute(P - 2)
+    2
+    """
+    return neg(a) if is_negative(a) else a % P
+
+def to_bytes(a: int) -> bytes:
+    """
+    Compute the encoding of the canonical representative of an integer.
+
+    >>> to_bytes(P + 1).hex()
+    '0100000000000000000000000000000000000000000000000000000000000000'
+    """
+    return (a % P).to_bytes(32, 'little')
+
+def from_bytes(bs: bytes) -> int:
+    """
+    Decode an encoding (ignoring the most significant bit).
+
+    >>> from_bytes(bytes([255] * 32))
+    18
+    """
+    return (int.from_bytes(bs, 'little') & (2 ** 255 - 1)) % P
+
+def sqrt_ratio_m1_ristretto255(u: int, v: int) -> Tuple[int, int]:
+    """
+    Compute ``SQRT_RATIO_M1`` (as specified in
+    `RFC 9496 <https://www.rfc-editor.org/rfc/rfc9496#section-4.2>`__).
+
+    >>> sqrt_ratio_m1_ristretto255(4, 1)
+    (2, 1)
+    """
+    (u, v) = (u % P, v % P)
+    r = (u * v ** 3 * pow(u * v ** 7, (P - 5) // 8, P)) % P
+    check = (v * r * r) % P
+    correct_sign = check == u
+    flipped_sign = check == (-u) % P
+    flipped_sign_i = check == (-u * SQRTM1) % P
+    if flipped_sign or flipped_sign_i:
+        r = (r * SQRTM1) % P
+    return (absolute(r), int(correct_sign or flipped_sign))
+
+def elligator2(r: int) -> int:
+    """
+    Compute the Elligator 2 map to the u-coordinate of a point on
+    Curve25519 (with ``Z = 2``).
+
+    >>> u = elligator2(1)
+    >>> chi25519(u ** 3 + A * u ** 2 + u)
+    1
+    """
+    x = (-A * invert(1 + 2 * r * r)) % P
+    return x if chi25519(x ** 3 + A * x * x + x) != P - 1 else (-x - A) % P
+
+def ladder_step(x1: int, x2: int, z2: int, x3: int, z3: int) -> Tuple[int, int, int, int]:
+    """
+    Compute one step of the Montgomery ladder (as specified in
+    `RFC 7748 <https://www.rfc-editor.org/rfc/rfc7748#section-5>`__).
+
+    >>> ladder_step(9, 1, 0, 9, 1)
+    (1, 0, 324, 36)
+    """
+    (a, b, c, d) = (x2 + z2, x2 - z2, x3 + z3, x3 - z3)
+    (aa, bb, da, cb) = (a * a, b * b, d * a, c * b)
+    e = aa - bb
+    return (
+        (aa * bb) % P, (e * (aa + 121665 * e)) % P,
+        ((da + cb) ** 2) % P, (x1 * (da - cb) ** 2) % P
+    )
+
+def x25519(scalar: bytes, u: bytes) -> bytes:
+    """
+    Compute the X25519 function (as specified in
+    `RFC 7748 <https://www.rfc-editor.org/rfc/rfc7748#section-5>`__).
+
+    >>> base = bytes([9] + [0] * 31)
+    >>> x25519(base, base).hex()
+    '422c8e7a6227d7bca1350b3e2bb7279f7897b87bb6854b783c60e80311ae3079'
+    """
+    k = int.from_bytes(scalar, 'little')
+    k = (k & ((1 << 254) - 8)) | (1 << 254)
+    x1 = from_bytes(u)
+    (x2, z2, x3, z3, swap) = (1, 0, x1, 1, 0)
+    for t in range(254, -1, -1):
+        bit = (k >> t) & 1
+        if swap ^ bit:
+            (x2, z2, x3, z3) = (x3, z3, x2, z2)
+        swap = bit
+        (x2, z2, x3, z3) = ladder_step(x1, x2, z2, x3, z3)
+    # No final swap is needed because clamping clears the lowest bit.
+    return to_bytes(x2 * invert(z2))
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
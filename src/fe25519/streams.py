@@ -0,0 +1,81 @@
+"""
+Streaming of elements of the :obj:`~fe25519.fe25519.fe25519` class to and
+from binary streams (such as files) in which each element is stored using
+its 32-byte encoding.
+
+Elements are read and written in large chunks (which are decoded and
+encoded using :obj:`~fe25519.fe25519.fe25519.from_bytes_many` and
+:obj:`~fe25519.fe25519.fe25519.to_bytes_many`), so the memory required does
+not depend on the length of the stream.
+
+>>> import io
+>>> stream = io.BytesIO()
+>>> write_elements(stream, [fe25519.one()] * 3)
+3
+>>> _ = stream.seek(0)
+>>> list(iter_elements(stream, chunk_size=2)) == [fe25519.one()] * 3
+True
+"""
+from __future__ import annotations
+from typing import BinaryIO, Iterable, Iterator
+import itertools
+import doctest
+
+try:
+    from fe25519.fe25519 import fe25519
+except ImportError: # pragma: no cover
+    from fe25519 import fe25519 # Module is being executed directly.
+
+def _check(chunk_size: int):
+    """Ensure that a chunk size is valid."""
+    if chunk_size < 1:
+        raise ValueError('chunk size must be a positive integer')
+
+def iter_elements(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[fe25519]:
+    """
+    Yield the elements stored in a binary stream, reading the encodings of
+    (at most) the specified number of elements at a time.
+
+    >>> import io
+    >>> list(iter_elements(io.BytesIO(bytes(33))))
+    Traceback (most recent call last):
+      ...
+    ValueError: stream ends with an incomplete element encoding
+    """
+    _check(chunk_size)
+    remainder = b''
+    while True:
+        data = stream.read(32 * chunk_size - len(remainder))
+        if not data:
+            break
+        data = remainder + data if remainder else data
+        end = len(data) - (len(data) % 32)
+        remainder = data[end:]
+        yield from fe25519.from_bytes_many(memoryview(data)[:end])
+    if remainder:
+        raise ValueError('stream ends with an incomplete element encoding')
+
+def write_elements(stream: BinaryIO, elements: Iterable[fe25519], chunk_size: int = 65536) -> int:
+    """
+    Write the encodings of all elements in an iterable to a binary stream
+    (encoding and writing at most the specified number of elements at a
+    time) and return the number of elements written.
+
+    >>> import io
+    >>> stream = io.BytesIO()
+    >>> write_elements(stream, iter([fe25519.one()]))
+    1
+    >>> stream.getvalue().hex()
+    '0100000000000000000000000000000000000000000000000000000000000000'
+    """
+    _check(chunk_size)
+    (iterator, count) = (iter(elements), 0)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return count
+        stream.write(fe25519.to_bytes_many(chunk))
+        count += len(chunk)
+
+if __name__ == '__main__':
+    doctest.testmod() # pragma: no cover
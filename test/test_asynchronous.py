@@ -0,0 +1,65 @@
+"""
+Test suite containing functional unit tests for the batch operations that
+can be awaited within an event loop.
+"""
+from __future__ import annotations
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+import concurrent.futures
+from test_fe25519 import inputs
+
+from fe25519 import asynchronous
+from fe25519.fe25519 import fe25519
+
+class Test_asynchronous(IsolatedAsyncioTestCase):
+    """
+    Tests for the batch operations that can be awaited.
+    """
+    # pylint: disable=missing-function-docstring
+    async def test_amap(self):
+        (xs, ys) = inputs(reduced=True)
+        rs = await asynchronous.amap(fe25519.__mul__, xs, ys, chunk_size=7)
+        self.assertEqual(
+            [r.to_bytes() for r in rs],
+            [(x * y).to_bytes() for (x, y) in zip(xs, ys)]
+        )
+
+    async def test_abatch_invert_executor(self):
+        (xs, _) = inputs(16, reduced=True)
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            rs = await asynchronous.abatch_invert(xs, chunk_size=5, executor=executor)
+        self.assertEqual(
+            [r.to_bytes() for r in rs],
+            [x.invert().to_bytes() for x in xs]
+        )
+
+    async def test_yields(self):
+        # Other tasks make progress between chunks.
+        (xs, _) = inputs(16, reduced=True)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asynchronous.amap('invert', xs, chunk_size=2)
+        task.cancel()
+        self.assertGreaterEqual(len(ticks), 8)
+
+    async def test_cancel(self):
+        (xs, _) = inputs(64, reduced=True)
+        processed = []
+
+        def invert(x):
+            processed.append(x)
+            return x.invert()
+
+        task = asyncio.create_task(asynchronous.amap(invert, xs, chunk_size=4))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertLess(len(processed), len(xs))
@@ -0,0 +1,257 @@
+"""
+Conformance harness that runs the functional unit tests for the class
+(and tests for the batch operations) against every available backend, and
+that compares the results of every method each backend replaces with those
+of the limb-based methods on reduced inputs.
+"""
+from __future__ import annotations
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+from fountains import fountains
+import test_fe25519
+from test_fe25519 import one_from_bytes, two_from_bytes
+
+from fe25519 import backends, benchmark
+from fe25519.backends import available_backends, get_backend, set_backend
+from fe25519.fe25519 import fe25519
+
+class conformance:
+    """
+    Mixin that runs tests while a specific backend is selected.
+    """
+    # pylint: disable=invalid-name,missing-function-docstring
+    backend = 'limb'
+
+    def setUp(self):
+        set_backend(self.backend)
+
+    def tearDown(self):
+        set_backend('limb')
+
+class batch(conformance):
+    """
+    Tests for the batch operations (checked against the scalar operations).
+    """
+    # pylint: disable=missing-function-docstring,no-member
+    def check_many(self, method, operation, arity, tight):
+        xss = [[], [], []]
+        for bs in fountains(8 * 5 * 2, limit=64):
+            (f1, f2) = two_from_bytes(bs)
+            (f1, f2) = (f1.reduce(), f2.reduce()) if tight else (f1, f2)
+            xss[0].append(f1)
+            xss[1].append(f2)
+        xss[0][3] = fe25519.zero() # Zero must be handled by inversion.
+        rs = getattr(fe25519, method)(*xss[:arity])
+        self.assertEqual(
+            [r.to_bytes() for r in rs],
+            [operation(*xs).to_bytes() for xs in zip(*xss[:arity])]
+        )
+        self.assertEqual(getattr(fe25519, method)(*[[]] * arity), [])
+
+    def test_add_many(self):
+        for tight in (True, False):
+            self.check_many('add_many', fe25519.__add__, 2, tight)
+
+    def test_sub_many(self):
+        for tight in (True, False):
+            self.check_many('sub_many', fe25519.__sub__, 2, tight)
+
+    def test_mul_many(self):
+        for tight in (True, False):
+            self.check_many('mul_many', fe25519.__mul__, 2, tight)
+
+    def test_sq_many(self):
+        for tight in (True, False):
+            self.check_many('sq_many', fe25519.sq, 1, tight)
+
+    def test_invert_many(self):
+        # Batch inversion matches scalar inversion for all elements that
+        # satisfy the bounds on limbs that this library maintains.
+        self.check_many('invert_many', fe25519.invert, 1, True)
+
+    def test_elligator2_many(self):
+        self.check_many('elligator2_many', fe25519.elligator2, 1, True)
+
+    def test_sqrt_ratio_m1_ristretto255_many(self):
+        for tight in (True, False):
+            (us, vs) = ([], [])
+            for bs in fountains(8 * 5 * 2, limit=32):
+                (f1, f2) = two_from_bytes(bs)
+                (f1, f2) = (f1.reduce(), f2.reduce()) if tight else (f1, f2)
+                us.extend([f1, f1.sq() * f2, -(f1.sq() * f2)])
+                vs.extend([f2, f2, f2])
+            (us[0], vs[1], us[2], vs[2]) = [fe25519.zero()] * 4
+            self.assertEqual(
+                [(x.to_bytes(), s) for (x, s) in fe25519.sqrt_ratio_m1_ristretto255_many(us, vs)],
+                [(x.to_bytes(), s) for (x, s) in map(fe25519.sqrt_ratio_m1_ristretto255, us, vs)]
+            )
+        self.assertEqual(fe25519.sqrt_ratio_m1_ristretto255_many([], []), [])
+
+class vectors(conformance):
+    """
+    Tests that compare the results of every method that a backend replaces
+    with those of the limb-based methods on reduced inputs (for which the
+    backend does not delegate to the limb-based methods).
+    """
+    # pylint: disable=missing-function-docstring,no-member,protected-access
+    arities = {
+        'reduce': 1, 'sq': 1, 'sq2': 1, 'pow22523': 1, 'invert': 1, 'chi25519': 1,
+        '__add__': 2, '__sub__': 2, '__mul__': 2, 'sqrt_ratio_m1_ristretto255': 2,
+        'sq_many': 1, 'invert_many': 1, 'add_many': 2, 'sub_many': 2, 'mul_many': 2,
+        'sqrt_ratio_m1_ristretto255_many': 2
+    }
+
+    @staticmethod
+    def encode(result):
+        if isinstance(result, fe25519):
+            return result.to_bytes()
+        if isinstance(result, (tuple, list)):
+            return [vectors.encode(r) for r in result]
+        return result
+
+    @staticmethod
+    def inputs():
+        (us, vs) = ([fe25519.zero()], [fe25519.one()])
+        for bs in fountains(8 * 5 * 2, limit=32):
+            (f1, f2) = [f.reduce() for f in two_from_bytes(bs)]
+            us.extend([f1, f1.sq() * f2, -(f1.sq() * f2)])
+            vs.extend([f2, f2, f2])
+        return (us, vs)
+
+    def evaluate(self, method, arity, xss):
+        if method.endswith('_many'):
+            return self.encode(getattr(fe25519, method)(*xss[:arity]))
+        return [self.encode(getattr(fe25519, method)(*xs)) for xs in zip(*xss[:arity])]
+
+    def test_vectors(self):
+        xss = self.inputs()
+        self.assertTrue(backends._tight(*xss[0], *xss[1]))
+        methods = backends._registry[self.backend].methods
+        self.assertTrue(len(methods) > 0)
+        for (method, implementation) in methods.items():
+            arity = self.arities[method]
+            set_backend('limb')
+            expected = self.evaluate(method, arity, xss)
+            set_backend(self.backend)
+            self.assertIs(fe25519.__dict__[method], implementation)
+            self.assertEqual(self.evaluate(method, arity, xss), expected, method)
+
+class Test_fe25519_bigint(conformance, test_fe25519.Test_fe25519):
+    """
+    Functional unit tests for the class using the integer-based backend
+    (most inputs of which are delegated to the limb-based methods).
+    """
+    backend = 'bigint'
+
+class Test_vectors_bigint(vectors, TestCase):
+    """
+    Tests for the integer-based backend on reduced inputs.
+    """
+    backend = 'bigint'
+
+class Test_batch_limb(batch, TestCase):
+    """
+    Tests for the batch operations of the limb-based backend.
+    """
+    backend = 'limb'
+
+class Test_batch_bigint(batch, TestCase):
+    """
+    Tests for the batch operations of the integer-based backend.
+    """
+    backend = 'bigint'
+
+@skipIf('numpy' not in available_backends(), 'NumPy is not installed')
+class Test_vectors_numpy(vectors, TestCase):
+    """
+    Tests for the NumPy-based backend on reduced inputs (this backend only
+    replaces batch operations, so the functional unit tests for the class
+    are not repeated for it).
+    """
+    backend = 'numpy'
+
+@skipIf('numpy' not in available_backends(), 'NumPy is not installed')
+class Test_batch_numpy(batch, TestCase):
+    """
+    Tests for the batch operations of the NumPy-based backend.
+    """
+    backend = 'numpy'
+
+    # pylint: disable=missing-function-docstring
+    def test_invert_many_sizes(self):
+        fs = [one_from_bytes(bytes([i] * 40)).reduce() for i in range(1, 8)]
+        for size in range(1, 8):
+            self.assertEqual(
+                [r.to_bytes() for r in fe25519.invert_many(fs[:size])],
+                [f.invert().to_bytes() for f in fs[:size]]
+            )
+
+class Test_backends(TestCase):
+    """
+    Tests for the backend registry and the benchmark.
+    """
+    # pylint: disable=missing-function-docstring,protected-access
+    def test_set_backend(self):
+        for name in available_backends():
+            set_backend(name)
+            self.assertEqual(get_backend(), name)
+        set_backend('limb')
+        self.assertEqual(fe25519.__mul__, backends._limb['__mul__'])
+        with self.assertRaises(ValueError):
+            set_backend('unknown')
+
+    def test_import(self):
+        # Importing the library must not import NumPy or the concurrency modules.
+        modules = ['numpy', 'asyncio', 'concurrent.futures']
+        imported = subprocess.run(
+            [sys.executable, '-c', 'import sys, fe25519; print(*sorted(sys.modules))'],
+            capture_output=True, check=True, text=True
+        ).stdout.split()
+        self.assertEqual([m for m in modules if m in imported], [])
+
+    def test_environment(self):
+        with patch.dict(os.environ, {'FE25519_BACKEND': 'bigint'}):
+            backends._backend_from_environment()
+            self.assertEqual(get_backend(), 'bigint')
+        set_backend('limb')
+
+    def test_sqrt_ratio_m1_ristretto255(self):
+        for bs in fountains(8 * 5 * 2, limit=32):
+            (f1, f2) = [f.reduce() for f in two_from_bytes(bs)]
+            for (u, v) in [(f1, f2), (f1.sq() * f2, f2), (-(f1.sq() * f2), f2)]:
+                results = []
+                for name in available_backends():
+                    set_backend(name)
+                    (x, was_square) = u.sqrt_ratio_m1_ristretto255(v)
+                    results.append((x.to_bytes(), was_square))
+                set_backend('limb')
+                self.assertEqual(len(set(results)), 1)
+
+    def test_invert_many_wide(self):
+        fs = [one_from_bytes(bytes([i] * 40)) for i in range(1, 8)]
+        expected = [f.to_bytes() for f in fe25519.invert_many([f.copy() for f in fs])]
+        set_backend('bigint')
+        self.assertEqual([f.to_bytes() for f in fe25519.invert_many(fs)], expected)
+        set_backend('limb')
+
+    def test_reduce_wide(self):
+        set_backend('bigint')
+        f = fe25519([2 ** 65, 0, 0, 0, 0])
+        self.assertEqual(f.copy().reduce().ns, backends._limb['reduce'](f).ns)
+        set_backend('limb')
+
+    def test_sq2_bound(self):
+        # The limb-based method wraps for limbs near 2**54, so these must be delegated.
+        f = fe25519([2 ** 54 - 1] * 5)
+        set_backend('bigint')
+        self.assertEqual(f.sq2().ns, backends._limb['sq2'](f).ns)
+        set_backend('limb')
+
+    def test_benchmark(self):
+        for name in available_backends():
+            timings = benchmark.benchmark(name, 2)
+            self.assertTrue(all(t > 0 for t in timings.values()))
+        self.assertEqual(get_backend(), 'limb')
@@ -0,0 +1,41 @@
+"""
+Test suite containing functional unit tests for the memory diagnostics.
+"""
+from __future__ import annotations
+from unittest import TestCase
+import contextlib
+import io
+import tracemalloc
+
+from fe25519.backends import get_backend
+from fe25519.diagnostics import profile, main
+
+class Test_diagnostics(TestCase):
+    """
+    Tests for profiling the memory footprints of operations.
+    """
+    # pylint: disable=missing-function-docstring
+    def test_profile(self):
+        footprints = profile('bigint', 8, ['elements', 'mul', 'mul_many', 'to_int'])
+        self.assertCountEqual(list(footprints), ['elements', 'mul', 'mul_many', 'to_int'])
+        for footprint in footprints.values():
+            self.assertTrue(footprint['retained_blocks'] >= 1)
+            self.assertTrue(0 < footprint['retained'] <= footprint['peak'])
+        # Each element retains at least its object and a list of five limbs.
+        self.assertTrue(footprints['elements']['retained'] > 100)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(get_backend(), 'limb')
+
+    def test_profile_tracing(self):
+        tracemalloc.start()
+        try:
+            self.assertEqual(list(profile('limb', 2, ['sq'])), ['sq'])
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_main_unknown_operation(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit):
+            main(['--size', '1', '--operations', 'mul', 'unknown'])
+        self.assertIn("invalid choice: 'unknown'", stderr.getvalue())
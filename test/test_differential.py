@@ -0,0 +1,69 @@
+"""
+Test suite containing functional unit tests for the reference
+implementations and the differential testing harness.
+"""
+from __future__ import annotations
+from unittest import TestCase
+from unittest.mock import patch
+import contextlib
+import io
+from fountains import fountains
+from test_fe25519 import one_from_bytes
+
+from fe25519 import reference
+from fe25519.backends import available_backends, get_backend
+from fe25519.differential import operation, operations, chains, covered, check, main
+
+class Test_differential(TestCase):
+    """
+    Tests for the reference implementations and for the harness that
+    compares them with every operation and backend.
+    """
+    # pylint: disable=missing-function-docstring
+    def test_reference(self):
+        for bs in fountains(8 * 5, limit=64):
+            f = one_from_bytes(bs)
+            a = reference.value(f.ns)
+            self.assertEqual(reference.to_bytes(a), f.to_bytes())
+            self.assertEqual(reference.mul(reference.invert(a), a), 1 - reference.is_zero(a))
+            self.assertEqual(reference.sq(reference.absolute(a)), reference.sq(a))
+
+    def test_operations(self):
+        for name in operations:
+            count = 4 if name in ('x25519', 'ladder_step') else 64
+            for backend in available_backends():
+                for domain in ('tight', 'wide'):
+                    if not covered(name, backend, domain):
+                        continue
+                    r = check(name, backend, count, domain=domain, block=16)
+                    self.assertEqual((r.inputs, r.mismatches, r.example), (count, 0, None))
+                    self.assertTrue(r.throughput() > 0)
+        self.assertEqual(get_backend(), 'limb')
+
+    def test_mismatch(self):
+        broken = operation('e', 'sq', reference.sq2)
+        with patch.dict(operations, {'sq': broken}):
+            r = check('sq', count=16)
+            self.assertTrue(0 < r.mismatches <= 16)
+            self.assertNotEqual(reference.sq(reference.value(r.example[0].ns)), 0)
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                total = main(['--count', '4', '--backends', 'limb', '--operations', 'sq'])
+            self.assertTrue(total > 0)
+            self.assertIn('first mismatch', stdout.getvalue())
+            with contextlib.redirect_stdout(stdout):
+                total = main(['--count', '4', '--backends', 'limb', '--operations', 'from_bytes'])
+            self.assertEqual(total, 0)
+            self.assertNotIn('from_bytes  wide', stdout.getvalue())
+        self.assertEqual(check('sq', count=0).throughput(), float('inf'))
+
+    def test_chains(self):
+        # A kernel that diverges from its method chain on wide inputs is detected.
+        broken = operation('e', lambda x: x.reduce().invert(), reference.invert)
+        with patch.dict(operations, {'invert': broken}):
+            self.assertTrue(check('invert', count=16, domain='wide').mismatches > 0)
+        self.assertEqual(set(chains), {
+            'pow22523', 'invert', 'chi25519', 'sqrt_ratio_m1_ristretto255'
+        })
+        with self.assertRaises(ValueError):
+            check('from_bytes', domain='wide')
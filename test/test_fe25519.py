@@ -3,8 +3,9 @@ Test suite containing functional unit tests for the exported primitives and
 classes.
 """
 from __future__ import annotations
-from typing import Tuple, Union, Optional, Callable, Iterable
+from typing import Tuple, List, Union, Optional, Callable, Iterable
 from unittest import TestCase
+import pickle
 from parts import parts
 from bitlist import bitlist
 from fountains import fountains
@@ -29,6 +30,16 @@ def two_from_bytes(bs: bytes) -> Tuple[fe25519, fe25519]:
     f2 = fe25519([int.from_bytes(p, 'little') for p in ps[5:]])
     return (f1, f2)
 
+def inputs(limit: int = 64, reduced: bool = False) -> Tuple[List[fe25519], List[fe25519]]:
+    """
+    Generate two lists of elements (optionally reduced so that their limbs
+    are canonical) using :obj:`fountains`.
+    """
+    pairs = [two_from_bytes(bs) for bs in fountains(8 * 5 * 2, limit=limit)]
+    if reduced:
+        pairs = [(f1.reduce(), f2.reduce()) for (f1, f2) in pairs]
+    return ([f1 for (f1, _) in pairs], [f2 for (_, f2) in pairs])
+
 def check_or_generate(
         testcase: TestCase,
         fs: Union[Iterable[int], Iterable[bool]],
@@ -174,6 +185,13 @@ class Test_fe25519(TestCase):
         fun = lambda bs: (one_from_bytes(bs).chi25519()).to_bytes()
         return check_or_generate_operation(self, fun, 1, bits)
 
+    def test_elligator2(
+            self,
+            bits='a8b236b6c87bf20f758036da15f852eb83c7dedd98b1a129c289d65e82f77707'
+        ):
+        fun = lambda bs: one_from_bytes(bs).elligator2().to_bytes()
+        return check_or_generate_operation(self, fun, 1, bits)
+
     def test_eq_true(
             self,
             bits='0101010101010101010101010101010101010101010101010101010101010101'
@@ -215,6 +233,16 @@ class Test_fe25519(TestCase):
             return f1.cmov(f2, b).to_bytes()
         return check_or_generate_operation(self, fun, 2, bits)
 
+    def test_cswap(
+            self,
+            bits='01da9d156e3e03043adaad53bcf8af55150ef319da198f44d6c8df44ca5fb324'
+        ):
+        def fun(bs):
+            ((f1, f2), b) = (two_from_bytes(bs), bs[0] % 2)
+            (g1, g2) = fe25519.cswap(f1, f2, b)
+            return g1.to_bytes() + g2.to_bytes()
+        return check_or_generate_operation(self, fun, 2, bits)
+
     def test_pow(
             self,
             bits='0000000000000000000000000000000000000000000000000000000000000000'
@@ -251,6 +279,77 @@ class Test_fe25519(TestCase):
             return bitlist([0 if fe25519.from_bytes(bytes(f)) == f else 255]).to_bytes()
         return check_or_generate_operation(self, fun, 1, bits)
 
+class Test_fe25519_examples(TestCase):
+    """
+    Tests for class methods that do not rely on generated specifications
+    (and that are thus not used when generating specifications).
+    """
+    # pylint: disable=missing-function-docstring
+    def test_elligator2_reference(self):
+        (p, a) = (2 ** 255 - 19, 486662)
+        for bs in fountains(8 * 5, limit=32):
+            f = one_from_bytes(bs).reduce()
+            r = int.from_bytes(f.to_bytes(), 'little')
+            x = (-a * pow(1 + 2 * r * r, p - 2, p)) % p
+            if pow((x ** 3 + a * x * x + x) % p, (p - 1) // 2, p) == p - 1:
+                x = (-x - a) % p
+            self.assertEqual(f.elligator2().to_bytes(), x.to_bytes(32, 'little'))
+
+    def test_predicates_many(self):
+        xs = [one_from_bytes(bs) for bs in fountains(8 * 5, limit=64)]
+        xs += [fe25519.zero(), fe25519([2 ** 51 - 19] + [2 ** 51 - 1] * 4), -fe25519.one()]
+        xs += [x.reduce() for x in xs]
+        ys = xs[1:] + xs[:1]
+        self.assertEqual(fe25519.is_zero_many(xs), bytes(x.is_zero() for x in xs))
+        self.assertEqual(fe25519.is_negative_many(xs), bytes(x.is_negative() for x in xs))
+        self.assertEqual(fe25519.eq_many(xs, ys), bytes(x == y for (x, y) in zip(xs, ys)))
+        self.assertEqual(fe25519.eq_many(xs, [x.reduce() for x in xs]), bytes([1] * len(xs)))
+
+    def test_bytes_many(self):
+        fs = [one_from_bytes(bs) for bs in fountains(8 * 5, limit=64)]
+        bs = fe25519.to_bytes_many(fs)
+        self.assertEqual(bs, b''.join(f.to_bytes() for f in fs))
+        self.assertEqual(
+            [f.ns for f in fe25519.from_bytes_many(bs)],
+            [fe25519.from_bytes(f.to_bytes()).ns for f in fs]
+        )
+        self.assertEqual(fe25519.from_bytes_many(bytes([255]) * 32)[0].ns, [2 ** 51 - 1] * 5)
+        self.assertEqual((fe25519.to_bytes_many([]), fe25519.from_bytes_many(b'')), (b'', []))
+        with self.assertRaises(ValueError):
+            fe25519.from_bytes_many(bytes(31))
+
+    def test_int(self):
+        fs = [one_from_bytes(bs) for bs in fountains(8 * 5, limit=64)]
+        ns = fe25519.to_int_many(fs)
+        self.assertEqual(ns, [int.from_bytes(f.to_bytes(), 'little') for f in fs])
+        gs = fe25519.from_int_many(ns)
+        self.assertEqual([g.ns for g in gs], [f.reduce().ns for f in fs])
+        self.assertEqual(fe25519.to_int_many(gs), ns)
+        self.assertEqual([fe25519.from_int(n - 2 * (2 ** 255 - 19)) for n in ns], gs)
+        self.assertEqual(fe25519.from_int(2 ** 255 - 19).ns, [0, 0, 0, 0, 0])
+
+    def test_hex(self):
+        for bs in fountains(8 * 5, limit=64):
+            f = one_from_bytes(bs)
+            self.assertEqual(f.to_hex(), f.to_bytes().hex())
+            self.assertEqual(fe25519.from_hex(bs[:32].hex()).ns, fe25519.from_bytes(bs[:32]).ns)
+        with self.assertRaises(ValueError):
+            fe25519.from_hex('00' * 33)
+
+    def test_pickle(self):
+        for bs in fountains(8 * 5, limit=16):
+            f = one_from_bytes(bs)
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                g = pickle.loads(pickle.dumps(f, protocol))
+                self.assertEqual((type(g), g.ns), (fe25519, f.ns))
+                g = pickle.loads(pickle.dumps(f.reduce(), protocol))
+                self.assertEqual((type(g), g.ns), (fe25519, f.reduce().ns))
+        self.assertLess(len(pickle.dumps(f.reduce())), 96)
+
+        # Results of arithmetic must not change when an element is pickled.
+        f = fe25519([2 ** 54 - 1] * 5)
+        self.assertEqual(pickle.loads(pickle.dumps(f)).sq2().ns, f.sq2().ns)
+
 if __name__ == '__main__':
     # Generate specifications for tests.
     test_fe25519 = Test_fe25519()
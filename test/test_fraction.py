@@ -0,0 +1,77 @@
+"""
+Test suite containing functional unit tests for the projective fraction
+class.
+"""
+from __future__ import annotations
+from unittest import TestCase
+from test_fe25519 import inputs
+
+from fe25519.backends import set_backend
+from fe25519.fe25519 import fe25519
+from fe25519.fraction import fe25519_fraction
+
+class Test_fraction(TestCase):
+    """
+    Tests for arithmetic on fractions (checked against arithmetic that
+    uses inversions).
+    """
+    # pylint: disable=missing-function-docstring
+    def test_operations(self):
+        for (f1, f2) in zip(*inputs(reduced=True)):
+            (q1, q2) = (fe25519_fraction(f1, f2), fe25519_fraction(f2, f1 + f2))
+            (e1, e2) = (f1 * ~f2, f2 * ~(f1 + f2))
+            for (q, e) in [
+                    (q1 + q2, e1 + e2), (q1 - q2, e1 - e2), (q1 * q2, e1 * e2),
+                    (q1 / q2, e1 * ~e2), (-q1, -e1), (q1 + f1, e1 + f1), (q1 / f1, e1 * ~f1),
+                    (f1 + q1, f1 + e1), (f1 - q1, f1 - e1), (f1 * q1, f1 * e1),
+                    (f1 / q1, f1 * ~e1)
+                ]:
+                self.assertEqual(q.to_bytes(), e.to_bytes())
+                self.assertEqual(bytes(q), e.to_bytes())
+                self.assertTrue(q == e)
+                self.assertTrue(e == q)
+                self.assertEqual(q.is_zero(), e.is_zero())
+            self.assertFalse(q1 == q1 + fe25519.one())
+
+    def test_reflected_bigint(self):
+        ((f1,), (f2,)) = inputs(1, reduced=True)
+        q = fe25519_fraction(f1, f2)
+        set_backend('bigint')
+        try:
+            (r1, r2) = (f2 + q, f2 * q)
+        finally:
+            set_backend('limb')
+        self.assertEqual((r1.to_bytes(), r2.to_bytes()), ((f2 + q).to_bytes(), (f2 * q).to_bytes()))
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            hash(fe25519_fraction(fe25519.one()))
+
+    def test_zero_denominator(self):
+        ((f1,), (f2,)) = inputs(1, reduced=True)
+        zero = fe25519_fraction(f1, fe25519.zero())
+        self.assertEqual(zero.is_zero(), 1)
+        self.assertEqual(zero.to_bytes(), bytes(32))
+        self.assertTrue(zero == fe25519.zero())
+        self.assertTrue(zero == fe25519_fraction(fe25519.zero(), f2))
+        self.assertFalse(zero == fe25519_fraction(f1, f2))
+        self.assertFalse(fe25519_fraction(f1, f2) == zero)
+
+        # A zero denominator yields zero (as inversion does) within arithmetic.
+        (q, e) = (fe25519_fraction(f1, f2), f1 * ~f2)
+        for (r, e_) in [
+                (zero + q, e), (q + zero, e), (zero - q, -e), (q - zero, e),
+                (zero * q, fe25519.zero()), (q * zero, fe25519.zero()),
+                (zero + f1, f1), (f1 - zero, f1), (zero / zero + f1, f1)
+            ]:
+            self.assertEqual(r.to_bytes(), e_.to_bytes())
+            self.assertTrue(r == e_)
+
+    def test_normalize_many(self):
+        fractions = [fe25519_fraction(f1, f2) for (f1, f2) in zip(*inputs(reduced=True))]
+        fractions.append(fe25519_fraction(fe25519.one(), fe25519.zero()))
+        self.assertEqual(
+            [f.to_bytes() for f in fe25519_fraction.normalize_many(fractions)],
+            [f.normalize().to_bytes() for f in fractions]
+        )
+        self.assertEqual(fe25519_fraction.normalize_many([]), [])
@@ -0,0 +1,225 @@
+"""
+Test suite containing functional unit tests for the generator of
+specialized kernels.
+"""
+from __future__ import annotations
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import os.path
+import hashlib
+import tempfile
+from fountains import fountains
+from test_fe25519 import one_from_bytes, two_from_bytes
+
+from fe25519 import kernels, reference
+from fe25519.differential import \
+    pow22523_chain, invert_chain, chi25519_chain, sqrt_ratio_m1_ristretto255_chain
+from fe25519.fe25519 import fe25519
+
+class Test_kernels(TestCase):
+    """
+    Tests for kernel generation, caching, and equivalence with the
+    general-purpose methods.
+    """
+    # pylint: disable=missing-function-docstring,protected-access
+    def test_equivalence(self):
+        # Kernel outputs must match (limb for limb) those of method chains.
+        k = kernels.kernels()
+        for bs in fountains(8 * 5 * 2, limit=64):
+            (f1, f2) = two_from_bytes(bs)
+            self.assertEqual(k.pow22523(*f1.ns), pow22523_chain(f1).ns)
+            self.assertEqual(k.invert(*f2.ns), invert_chain(f2).ns)
+            self.assertEqual(k.chi25519(*f1.ns), chi25519_chain(f1).ns)
+            (ns, was_square) = k.sqrt_ratio_m1_ristretto255(*f1.ns, *f2.ns)
+            (x, was_square_) = sqrt_ratio_m1_ristretto255_chain(f1, f2)
+            self.assertEqual((ns, was_square), (x.ns, was_square_))
+
+    def test_sqrt_ratio_m1_ristretto255_wide(self):
+        # Limbs between 2**54 and 2**64 must yield the same limbs as the chain.
+        pairs = [
+            (
+                [481834499684254248, 197617503191679127, 1248128902689648,
+                 54916587245645293, 1286574276208709588],
+                [23169855453994236, 3139595647509394, 5544122989462877,
+                 37885110498556475, 2973677396423083]
+            ),
+            (
+                [1179573286573373, 23303288017840109, 2994633582878541032,
+                 8180167564021997, 257712674924234946],
+                [41583478201387309, 607884575432480928, 214363066864580266,
+                 380629350593855451, 9098216867201057]
+            )
+        ]
+        for bs in fountains(8 * 5 * 2, limit=256):
+            (f1, f2) = two_from_bytes(bs)
+            pairs.append(([n >> (n % 13) for n in f1.ns], [n >> (n % 11) for n in f2.ns]))
+        for (ns, ms) in pairs:
+            (u, v) = (fe25519(ns), fe25519(ms))
+            (x, was_square) = u.sqrt_ratio_m1_ristretto255(v)
+            (x_, was_square_) = sqrt_ratio_m1_ristretto255_chain(u, v)
+            self.assertEqual((x.ns, was_square), (x_.ns, was_square_))
+
+    def test_square_roots(self):
+        for bs in fountains(8 * 5 * 2, limit=16):
+            (f1, f2) = [fe25519.from_bytes(f.to_bytes()) for f in two_from_bytes(bs)]
+            (_, was_square) = (f1.sq() * f2).sqrt_ratio_m1_ristretto255(f2)
+            self.assertEqual(was_square, 1)
+
+    def test_x25519(self):
+        # Test vectors from RFC 7748 (Sections 5.2 and 6.1).
+        for (scalar, u, r) in [
+            (
+                'a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4',
+                'e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c',
+                'c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552'
+            ),
+            (
+                '4b66e9d4d1b4673c5ad22691957d6af5c11b6421e0ea01d42ca4169e7918ba0d',
+                'e5210f12786811d3f4b7959d0538ae2c31dbe7106fc03c3efc4cd549c715a493',
+                '95cbde9476e8907d7aade45cb4b873f88b595a68799fa152e6f8f7647aac7957'
+            ),
+            (
+                '77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a',
+                '09' + '00' * 31,
+                '8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a'
+            )
+        ]:
+            self.assertEqual(
+                fe25519.x25519(bytes.fromhex(scalar), bytes.fromhex(u)).hex(), r
+            )
+
+    def test_x25519_lengths(self):
+        for (scalar, u) in [(bytes(31), bytes(32)), (bytes(32), bytes(33)), (b'', b'')]:
+            with self.assertRaises(ValueError):
+                fe25519.x25519(scalar, u)
+
+    def test_x25519_reference(self):
+        for bs in fountains(64, limit=32):
+            (scalar, u) = (bs[:32], bs[32:])
+            self.assertEqual(fe25519.x25519(scalar, u), reference.x25519(scalar, u))
+
+    def test_ladder_step(self):
+        for bs in fountains(8 * 5 * 2, limit=32):
+            (f1, f2) = [f.reduce() for f in two_from_bytes(bs)]
+            (g1, g2) = (f1 * f2, f1 + f2)
+            (x2, z2, x3, z3) = fe25519.ladder_step(f1, f2, g1, g2, f1)
+            (a, b, c, d) = (f2 + g1, f2 - g1, g2 + f1, g2 - f1)
+            (aa, bb, da, cb) = (a.sq(), b.sq(), d * a, c * b)
+            e = aa - bb
+            self.assertEqual(
+                [f.to_bytes() for f in (x2, z2, x3, z3)],
+                [f.to_bytes() for f in (
+                    aa * bb,
+                    e * (aa + fe25519([121665, 0, 0, 0, 0]) * e),
+                    (da + cb).sq(),
+                    f1 * (da - cb).sq()
+                )]
+            )
+
+    def test_fused(self):
+        # Fused operations match the corresponding method chains for all
+        # elements that satisfy the bounds on limbs that this library
+        # maintains, and are exact for all other elements.
+        p = 2 ** 255 - 19
+        value = lambda f: sum(n << (51 * i) for (i, n) in enumerate(f.ns)) % p
+        for bs in fountains(8 * 5 * 3, limit=64):
+            (f, g, c) = (one_from_bytes(bs[i:i + 40]) for i in range(0, 120, 40))
+            for (f, g, c) in [(f, g, c), (f.reduce(), g.reduce(), c.reduce())]:
+                results = [f.mul_add(g, c), f.mul_sub(g, c), f.sq_add(c), f.sq_mul(g)]
+                self.assertTrue(all(max(r.ns) < 2 ** 52 for r in results))
+                self.assertEqual(
+                    [value(r) for r in results],
+                    [
+                        (value(f) * value(g) + value(c)) % p,
+                        (value(f) * value(g) - value(c)) % p,
+                        (value(f) ** 2 + value(c)) % p,
+                        (value(f) ** 2 * value(g)) % p
+                    ]
+                )
+            self.assertEqual(
+                [r.to_bytes() for r in results],
+                [r.to_bytes() for r in [f * g + c, f * g - c, f.sq() + c, f.sq() * g]]
+            )
+
+    def test_emitter_sub_add(self):
+        # Exercise operations on unbounded inputs that the built-in kernels
+        # never perform.
+        e = kernels.emitter(['a', 'b'])
+        e.sub('c', 'a', 'b')
+        e.add('d', 'a', 'b')
+        e.result('c', 'd')
+        source = 'def f(' + ', '.join(e.limbs('a') + e.limbs('b')) + '):\n' + \
+            '\n'.join('    ' + line for line in e.lines)
+        scope = {}
+        exec(source, scope) # pylint: disable=exec-used
+        for bs in fountains(8 * 5 * 2, limit=64):
+            (f1, f2) = two_from_bytes(bs)
+            (c, d) = scope['f'](*f1.ns, *f2.ns)
+            self.assertEqual((c, d), ((f1 - f2).ns, (f1 + f2).ns))
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict(os.environ, {'FE25519_KERNEL_CACHE': directory}):
+                self.assertEqual(kernels._cache_directory(), directory)
+                module = kernels._load(kernels._cache_directory())
+                self.assertTrue(os.path.exists(module.__file__))
+                self.assertEqual(os.path.dirname(module.__file__), directory)
+
+                # The cached file is named after the digest of its contents.
+                digest = hashlib.sha256(kernels.source().encode('utf-8')).hexdigest()
+                self.assertEqual(
+                    os.path.basename(module.__file__), 'fe25519_kernels_' + digest + '.py'
+                )
+
+                # The cached file is reused when it already exists.
+                self.assertEqual(kernels._load(directory).__file__, module.__file__)
+
+                f = one_from_bytes(bytes(range(40)))
+                self.assertEqual(module.invert(*f.ns), f.invert().ns)
+
+    def test_cache_tampered(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = kernels._load(directory).__file__
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('def invert(*ns):\n    return None\n')
+            module = kernels._load(directory) # The file is checked and replaced.
+            self.assertEqual(module.invert(1, 0, 0, 0, 0), [1, 0, 0, 0, 0])
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), kernels.source().encode('utf-8'))
+
+    def test_cache_stale(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, '__pycache__'))
+            stale = [
+                os.path.join(directory, 'fe25519_kernels_0123456789abcdef.py'),
+                os.path.join(directory, '__pycache__', 'fe25519_kernels_0123456789abcdef.pyc')
+            ]
+            for path in stale:
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write('')
+            path = kernels._load(directory).__file__
+            self.assertEqual(
+                [os.path.exists(path) for path in stale] + [os.path.exists(path)],
+                [False, False, True]
+            )
+
+    def test_cache_disabled(self):
+        with patch.dict(os.environ, {'FE25519_KERNEL_CACHE': ''}):
+            self.assertIsNone(kernels._cache_directory())
+            module = kernels._load(kernels._cache_directory())
+            self.assertEqual(module.invert(1, 0, 0, 0, 0), [1, 0, 0, 0, 0])
+
+    def test_cache_default(self):
+        with patch.dict(os.environ, {'XDG_CACHE_HOME': 'cache'}):
+            os.environ.pop('FE25519_KERNEL_CACHE', None)
+            self.assertEqual(kernels._cache_directory(), os.path.join('cache', 'fe25519'))
+
+    def test_cache_unwritable(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'file')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('')
+            # A directory cannot be created beneath an ordinary file.
+            module = kernels._load(os.path.join(path, 'fe25519'))
+            self.assertEqual(module.invert(1, 0, 0, 0, 0), [1, 0, 0, 0, 0])
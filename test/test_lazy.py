@@ -0,0 +1,68 @@
+"""
+Test suite containing functional unit tests for lazy evaluation of
+formulas.
+"""
+from __future__ import annotations
+from unittest import TestCase
+from unittest.mock import patch
+from test_fe25519 import inputs
+
+from fe25519.backends import available_backends, set_backend
+from fe25519.fe25519 import fe25519
+from fe25519.lazy import lazy, evaluate, count
+
+def formula(x, y):
+    """
+    Formula (with duplicated subexpressions) that can be evaluated eagerly
+    or lazily.
+    """
+    t = x * y + y * x
+    u = (t * t).sq().sq() - (-x)
+    return (u * ~(t + x) + ~(y * x + x * y + x), ~(u * ~t))
+
+class Test_lazy(TestCase):
+    """
+    Tests for optimization and evaluation of lazily evaluated formulas.
+    """
+    # pylint: disable=missing-function-docstring
+    def test_scalar(self):
+        for (x, y) in zip(*inputs(32, reduced=True)):
+            self.assertEqual(
+                [r.to_bytes() for r in evaluate(*formula(lazy(x), lazy(y)))],
+                [r.to_bytes() for r in formula(x, y)]
+            )
+
+    def test_vector(self):
+        (xs, ys) = inputs(32, reduced=True)
+        xs[0] = fe25519.zero() # Inversions of zero must yield zero.
+        expected = [[r.to_bytes() for r in formula(x, y)] for (x, y) in zip(xs, ys)]
+        for backend in available_backends():
+            set_backend(backend)
+            try:
+                (rs, ss) = evaluate(*formula(lazy(xs), lazy(ys)))
+            finally:
+                set_backend('limb')
+            self.assertEqual([[r.to_bytes(), s.to_bytes()] for (r, s) in zip(rs, ss)], expected)
+        (rs, _) = evaluate(*formula(lazy(xs), lazy(ys[0])))
+        self.assertEqual(rs[1].to_bytes(), formula(xs[1], ys[0])[0].to_bytes())
+        with self.assertRaises(ValueError):
+            evaluate(lazy(xs) + lazy(ys[1:]))
+
+    def test_optimization(self):
+        (x, y) = (lazy(fe25519.one()), lazy(fe25519.one()))
+        self.assertEqual(
+            count(*formula(x, y)),
+            {'mul': 3, 'add': 3, 'sq': 3, 'neg': 1, 'sub': 1, 'invert': 3}
+        )
+        # Inversions that are ready at the same time share one batch.
+        with patch.object(fe25519, 'invert_many', wraps=fe25519.invert_many) as invert_many:
+            evaluate(*formula(x, y))
+        self.assertEqual([len(c.args[0]) for c in invert_many.call_args_list], [2, 1])
+
+    def test_long_chain(self):
+        ((x,), _) = inputs(1, reduced=True)
+        (r, s) = (lazy(x), x)
+        for _ in range(2000):
+            (r, s) = (r * r, s.sq())
+        self.assertEqual(count(r), {'sq': 2000})
+        self.assertEqual(r.evaluate().to_bytes(), s.to_bytes())
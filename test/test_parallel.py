@@ -0,0 +1,94 @@
+"""
+Test suite containing functional unit tests for sharing elements between
+threads and for the parallel batch operations.
+"""
+from __future__ import annotations
+from unittest import TestCase
+from unittest.mock import patch
+import concurrent.futures
+from test_fe25519 import inputs
+
+from fe25519 import parallel
+from fe25519.backends import set_backend
+from fe25519.fe25519 import fe25519
+
+CONSTANTS = ['d', 'd2', 'sqrtm1', 'invsqrtamd', 'onemsqd', 'sqdmone', 'sqrtadm1', 'curve25519_A']
+
+class Test_parallel(TestCase):
+    """
+    Tests for thread safety and for the parallel batch operations.
+    """
+    # pylint: disable=missing-function-docstring
+    def test_shared(self):
+        # No method may modify an element, so elements (including the
+        # shared constants) can be used concurrently by many threads.
+        originals = {name: list(getattr(fe25519, name).ns) for name in CONSTANTS}
+        (xs, ys) = inputs()
+        ys = [y.reduce() for y in ys]
+        xs_ = [list(x.ns) for x in xs]
+
+        def work(i):
+            x = xs[i % len(xs)]
+            return [
+                (x.to_bytes(), x.is_zero(), x.is_negative(), abs(x).to_bytes()),
+                [getattr(fe25519, name).to_bytes() for name in CONSTANTS],
+                x.sqrt_ratio_m1_ristretto255(fe25519.sqrtm1)[0].to_bytes(),
+                (ys[i % len(ys)] * fe25519.d).to_bytes()
+            ]
+
+        expected = [work(i) for i in range(256)]
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            self.assertEqual(list(pool.map(work, range(256))), expected)
+
+        self.assertEqual({name: getattr(fe25519, name).ns for name in CONSTANTS}, originals)
+        self.assertEqual([x.ns for x in xs], xs_)
+
+    def test_reduce_unchanged(self):
+        f = fe25519([2 ** 64 - 1] * 5)
+        self.assertNotEqual(f.reduce().ns, f.ns)
+        self.assertEqual(f.ns, [2 ** 64 - 1] * 5)
+
+    def test_pmap_threads(self):
+        (xs, ys) = inputs()
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            self.assertEqual(
+                [r.to_bytes() for r in parallel.pmap(fe25519.__mul__, xs, ys, pool=pool)],
+                [(x * y).to_bytes() for (x, y) in zip(xs, ys)]
+            )
+
+    def test_pmap_default(self):
+        (xs, _) = inputs(16)
+        self.assertEqual(
+            [r.to_bytes() for r in parallel.pmap('invert', xs, workers=2, chunk_size=5)],
+            [x.invert().to_bytes() for x in xs]
+        )
+
+    def test_pmap_free_threaded(self):
+        # Without the GIL, a pool of threads is used (so lambdas are supported).
+        (xs, _) = inputs(16)
+        with patch.object(parallel, 'gil_enabled', return_value=False):
+            with parallel.executor(2) as pool:
+                self.assertIsInstance(pool, concurrent.futures.ThreadPoolExecutor)
+            self.assertEqual(
+                [r.to_bytes() for r in parallel.pmap(lambda x: x.sq(), xs, workers=2, chunk_size=5)],
+                [x.sq().to_bytes() for x in xs]
+            )
+
+    def test_pbatch(self):
+        (_, ys) = inputs(16, reduced=True)
+        set_backend('bigint')
+        try:
+            rs = parallel.pbatch('invert_many', ys, chunk_size=3)
+            with concurrent.futures.ThreadPoolExecutor(4) as pool:
+                rs_ = parallel.pbatch(fe25519.invert_many, ys, chunk_size=3, pool=pool)
+        finally:
+            set_backend('limb')
+        self.assertEqual([r.to_bytes() for r in rs], [r.to_bytes() for r in rs_])
+        self.assertEqual(
+            [r.to_bytes() for r in rs],
+            [y.invert().to_bytes() for y in ys]
+        )
+
+    def test_chunk_size(self):
+        with self.assertRaises(ValueError):
+            parallel.pmap('sq', [fe25519.one()], chunk_size=0)
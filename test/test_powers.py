@@ -0,0 +1,86 @@
+"""
+Test suite containing functional unit tests for tables of powers of fixed
+base elements.
+"""
+from __future__ import annotations
+from unittest import TestCase
+import os.path
+import tempfile
+from fountains import fountains
+from test_fe25519 import one_from_bytes
+
+from fe25519.fe25519 import fe25519
+from fe25519.powers import power_table
+
+P = 2 ** 255 - 19
+
+def value(f: fe25519) -> int:
+    """Obtain the canonical integer corresponding to an element."""
+    return int.from_bytes(f.to_bytes(), 'little')
+
+class Test_powers(TestCase):
+    """
+    Tests for computing, packing, and loading tables of powers.
+    """
+    # pylint: disable=missing-function-docstring,protected-access
+    def test_pow(self):
+        g = one_from_bytes(bytes(range(40))).reduce()
+        tables = [g.fixed_base(window) for window in (1, 3, 4, 8)]
+        for bs in fountains(32, limit=32):
+            e = int.from_bytes(bs, 'little') >> 1
+            for table in tables:
+                self.assertEqual(value(table.pow(e)), pow(value(g), e, P))
+        for table in tables:
+            self.assertEqual(table.pow(P - 1), fe25519.one())
+            self.assertEqual(table.pow(1), g)
+
+    def test_zero(self):
+        table = fe25519.zero().fixed_base(bits=16)
+        self.assertEqual((table.pow(0), table.pow(5)), (fe25519.one(), fe25519.zero()))
+
+    def test_invalid(self):
+        g = fe25519.one()
+        for (window, bits) in [(0, 255), (9, 255), (4, 0)]:
+            with self.assertRaises(ValueError):
+                g.fixed_base(window, bits)
+        with self.assertRaises(ValueError):
+            g.fixed_base().pow(-1)
+        bs = g.fixed_base(bits=8).to_bytes()
+        for bs_ in [bs[:-1], bs[:9], bs[:8] + bytes([1, 0]) + bs[10:], bytes(len(bs))]:
+            with self.assertRaises(ValueError):
+                power_table.from_bytes(bs_)
+
+    def test_save_load(self):
+        g = one_from_bytes(bytes(range(40, 80))).reduce()
+        table = g.fixed_base(6)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.bin')
+            table.save(path)
+            with power_table.load(path) as loaded:
+                self.assertTrue(all(entry is None for entry in loaded._entries))
+                self.assertEqual(loaded.pow(12345).to_bytes(), table.pow(12345).to_bytes())
+                self.assertEqual(len([e for e in loaded._entries if e is not None]), 2)
+                self.assertEqual(loaded.base(), g)
+                self.assertEqual(loaded.to_bytes(), table.to_bytes())
+                mapped = loaded._mmap
+            self.assertTrue(mapped.closed)
+            self.assertEqual((loaded._buffer, loaded._mmap), (None, None))
+            self.assertEqual(loaded.pow(12345).to_bytes(), table.pow(12345).to_bytes())
+
+    def test_load_invalid(self):
+        headers = [
+            bytes(12),
+            b'fe25519p' + bytes([1, 9]) + (1).to_bytes(2, 'little'), # Window is too wide.
+            b'fe25519p' + bytes([1, 4]) + (0).to_bytes(2, 'little') # No windows.
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.bin')
+            for header in headers:
+                with open(path, 'wb') as file:
+                    file.write(header + bytes(32 * 511))
+                with self.assertRaises(ValueError):
+                    power_table.load(path)
+                with open(path, 'wb') as file:
+                    file.write(header)
+                with self.assertRaises(ValueError):
+                    power_table.load(path)
@@ -0,0 +1,60 @@
+"""
+Test suite containing functional unit tests for streaming elements to and
+from binary streams.
+"""
+from __future__ import annotations
+from unittest import TestCase
+import io
+import os.path
+import tempfile
+from fountains import fountains
+from test_fe25519 import one_from_bytes
+
+from fe25519.fe25519 import fe25519
+from fe25519.streams import iter_elements, write_elements
+
+class trickle(io.RawIOBase):
+    """Stream that returns at most a few bytes per read (as a pipe might)."""
+    def __init__(self: trickle, bs: bytes):
+        super().__init__()
+        self.stream = io.BytesIO(bs)
+
+    def readable(self: trickle) -> bool:
+        return True
+
+    def read(self: trickle, size: int = -1) -> bytes:
+        return self.stream.read(min(size, 7))
+
+class Test_streams(TestCase):
+    """
+    Tests for reading and writing streams of element encodings.
+    """
+    # pylint: disable=missing-function-docstring
+    def test_file(self):
+        fs = [one_from_bytes(bs) for bs in fountains(8 * 5, limit=100)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'elements.bin')
+            with open(path, 'wb') as file:
+                self.assertEqual(write_elements(file, iter(fs), chunk_size=7), 100)
+            self.assertEqual(os.path.getsize(path), 3200)
+            with open(path, 'rb') as file:
+                self.assertEqual(
+                    [f.ns for f in iter_elements(file, chunk_size=9)],
+                    [fe25519.from_bytes(f.to_bytes()).ns for f in fs]
+                )
+
+    def test_short_reads(self):
+        fs = [one_from_bytes(bs).reduce() for bs in fountains(8 * 5, limit=10)]
+        self.assertEqual(
+            [f.to_bytes() for f in iter_elements(trickle(fe25519.to_bytes_many(fs)), 2)],
+            [f.to_bytes() for f in fs]
+        )
+        self.assertEqual(list(iter_elements(io.BytesIO(b''))), [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(iter_elements(io.BytesIO(bytes(64)), 0))
+        with self.assertRaises(ValueError):
+            write_elements(io.BytesIO(), [], 0)
+        with self.assertRaises(ValueError):
+            list(iter_elements(trickle(bytes(70))))